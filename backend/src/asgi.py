@@ -0,0 +1,115 @@
+"""ASGI entry point, e.g. ``uvicorn backend.src.asgi:app``.
+
+/api/bgg/hot and /api/bgg/search run on the event loop through bgg's async
+client, so a cold BGG fetch doesn't hold a worker thread. Every other path
+goes to the Flask app through asgiref's WsgiToAsgi when it is installed.
+"""
+
+import urllib.parse
+
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import parse_accept_header, parse_etags
+
+from . import bgg
+from . import index
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # optional: only the native routes are served without it
+    WsgiToAsgi = None
+
+
+_ROUTES = {
+    "/api/bgg/hot": bgg.hot_games_async,
+    "/api/bgg/search": bgg.search_games_async,
+}
+
+_flask_app = WsgiToAsgi(index.app) if WsgiToAsgi is not None else None
+
+
+def _headers(scope):
+    return {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+
+
+async def _send(send, status, headers, body=b""):
+    headers = dict(headers)
+    headers["Content-Length"] = str(len(body))
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _serve_bgg(scope, send, handler):
+    # Same caching, ETag and gzip behaviour as the Flask views
+    path = scope["path"]
+    endpoint = path.rsplit("/", 1)[-1]
+    args = MultiDict(urllib.parse.parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+    request_headers = _headers(scope)
+    response_headers = index.cors_headers(request_headers.get("origin"))
+    response_headers["Vary"] = "Origin, Accept-Encoding"
+
+    key = (path, tuple(sorted(args.items(multi=True))))
+    generation = bgg._CACHE_GENERATION
+    cached = bgg._cached_body(key, generation)
+    if cached is not None:
+        etag, body = cached
+        result = "hit"
+    else:
+        payload, status = await handler(args)
+        body = index.app.json.response(payload).get_data()
+        if status != 200:
+            response_headers["Content-Type"] = "application/json"
+            await _send(send, status, response_headers, body)
+            return
+        etag = bgg._store_body(key, generation, body)
+        result = "miss"
+
+    response_headers["Cache-Control"] = bgg._cache_control()
+    matched = bgg._matched_etag(etag, parse_etags(request_headers.get("if-none-match")))
+    if matched:
+        bgg._METRICS.inc("bgg_response_cache_total", endpoint=endpoint, result="not_modified")
+        response_headers["ETag"] = f'"{matched}"'
+        await _send(send, 304, response_headers)
+        return
+
+    bgg._METRICS.inc("bgg_response_cache_total", endpoint=endpoint, result=result)
+    response_headers["Content-Type"] = "application/json"
+    if len(body) >= index.GZIP_MIN_BYTES and parse_accept_header(request_headers.get("accept-encoding"))["gzip"]:
+        body = index.gzip_body(body, etag)
+        etag = f"{etag}-gzip"
+        response_headers["Content-Encoding"] = "gzip"
+    response_headers["ETag"] = f'"{etag}"'
+    await _send(send, 200, response_headers, body)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await bgg._close_async_client()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    handler = _ROUTES.get(scope["path"])
+    if handler is not None and scope["method"] == "GET":
+        await _serve_bgg(scope, send, handler)
+    elif _flask_app is not None:
+        await _flask_app(scope, receive, send)
+    else:
+        await _send(
+            send, 501, {"Content-Type": "text/plain"},
+            b"Install asgiref to serve the rest of the API over ASGI\n",
+        )
@@ -1,5 +1,9 @@
+import hashlib
 import os
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from flask import Blueprint, current_app, jsonify, make_response, request
@@ -7,34 +11,172 @@ from werkzeug.security import generate_password_hash, check_password_hash
 
 import jwt
 
+from .ttlcache import TTLCache
+
 bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "users.db")
 
+_DB_LOCAL = threading.local()
+_DB_INIT_LOCK = threading.Lock()
+_DB_READY_PATHS = set()
+
+# Schema migrations, applied in order; PRAGMA user_version records how many
+# have run. Append new steps, never edit old ones. The first step is
+# idempotent so databases created before versioning pick it up cleanly.
+_MIGRATIONS = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        password_hash TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+)
+
 
-def _get_db():
-    conn = sqlite3.connect(DB_PATH)
+def _open_db(path):
+    conn = sqlite3.connect(path, timeout=5.0)
     conn.row_factory = sqlite3.Row
+    try:
+        # WAL so /me reads don't wait on a registration commit. synchronous
+        # stays at the default FULL: unlike cache.db, accounts can't be refetched.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+    except sqlite3.DatabaseError:
+        pass
     return conn
 
 
+def _get_db():
+    # One connection per thread, kept open across requests; callers must not
+    # close it. The first call for a DB_PATH applies pending migrations, so
+    # importing the app never touches users.db.
+    path = DB_PATH
+    conn = getattr(_DB_LOCAL, "conn", None)
+    if conn is not None and getattr(_DB_LOCAL, "path", None) == path:
+        return conn
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _init_db()
+    conn = _open_db(path)
+    _DB_LOCAL.conn = conn
+    _DB_LOCAL.path = path
+    return conn
+
+
+def _reset_db():
+    # Drop this thread's connection and forget which paths are migrated
+    # (used when DB_PATH is swapped, e.g. by benchmarks).
+    conn = getattr(_DB_LOCAL, "conn", None)
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _DB_LOCAL.conn = None
+    _DB_LOCAL.path = None
+    with _DB_INIT_LOCK:
+        _DB_READY_PATHS.clear()
+
+
 def _init_db():
-    conn = _get_db()
+    path = DB_PATH
+    if path in _DB_READY_PATHS:
+        return
+    with _DB_INIT_LOCK:
+        if path in _DB_READY_PATHS:
+            return
+        conn = _open_db(path)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for step, sql in enumerate(_MIGRATIONS[version:], start=version + 1):
+                with conn:
+                    conn.execute(sql)
+                    conn.execute(f"PRAGMA user_version = {step}")
+        finally:
+            conn.close()
+        _DB_READY_PATHS.add(path)
+
+
+# Verified /me lookups keyed by a digest of the token cookie, so repeat calls
+# skip jwt.decode and the users query. Entries expire at the token's exp and
+# carry the user's version; _invalidate_user bumps it after a row changes.
+_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "1024"))
+_TOKEN_CACHE = TTLCache(capacity=_TOKEN_CACHE_SIZE, default_ttl=60)
+_USER_VERSIONS = {}
+_USER_VERSIONS_LOCK = threading.Lock()
+
+
+def _invalidate_user(user_id):
+    # Call after any write to a user's row
+    with _USER_VERSIONS_LOCK:
+        _USER_VERSIONS[user_id] = _USER_VERSIONS.get(user_id, 0) + 1
+
+
+# Password hashing runs on a small pool instead of the request thread, so a
+# burst of logins can only take AUTH_HASH_WORKERS cores' worth of KDF time.
+# At most AUTH_HASH_QUEUE more jobs may wait; beyond that requests get a 503.
+_HASH_WORKERS = int(os.environ.get("AUTH_HASH_WORKERS", "2"))
+_HASH_QUEUE = int(os.environ.get("AUTH_HASH_QUEUE", "32"))
+_HASH_POOL = None
+_HASH_POOL_LOCK = threading.Lock()
+_HASH_SLOTS = threading.BoundedSemaphore(_HASH_WORKERS + _HASH_QUEUE)
+
+# Work factor as a werkzeug method string, e.g. "scrypt", "scrypt:65536:8:1"
+# or "pbkdf2:sha512". Stored hashes whose parameters differ are rehashed on
+# the next successful login.
+_PASSWORD_METHOD = os.environ.get("AUTH_PASSWORD_METHOD", "scrypt")
+# The method as werkzeug writes it into hashes, defaults filled in
+# ("pbkdf2:sha512" -> "pbkdf2:sha512:1000000"); hashing once at import also
+# rejects a bad setting at startup.
+_PASSWORD_PREFIX = generate_password_hash("", method=_PASSWORD_METHOD).split("$", 1)[0]
+
+
+class HashQueueFull(Exception):
+    """Raised when the password hashing queue is at its depth limit."""
+
+
+def _hash_pool():
+    global _HASH_POOL
+    if _HASH_POOL is None:
+        with _HASH_POOL_LOCK:
+            if _HASH_POOL is None:
+                _HASH_POOL = ThreadPoolExecutor(max_workers=_HASH_WORKERS, thread_name_prefix="auth-hash")
+    return _HASH_POOL
+
+
+def _run_hash(fn, *args):
+    # Slots count running and queued jobs; fail fast instead of queueing more
+    if not _HASH_SLOTS.acquire(blocking=False):
+        raise HashQueueFull()
     try:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                email TEXT NOT NULL UNIQUE,
-                name TEXT NOT NULL,
-                password_hash TEXT NOT NULL,
-                created_at TEXT NOT NULL
-            )
-            """
-        )
-        conn.commit()
-    finally:
-        conn.close()
+        future = _hash_pool().submit(fn, *args)
+    except Exception:
+        _HASH_SLOTS.release()
+        raise
+    future.add_done_callback(lambda _: _HASH_SLOTS.release())
+    return future.result()
+
+
+def _check_and_rehash(stored_hash, password):
+    # (matches, new hash if the stored one uses another method or cost)
+    if not check_password_hash(stored_hash, password):
+        return False, None
+    if stored_hash.split("$", 1)[0] != _PASSWORD_PREFIX:
+        return True, generate_password_hash(password, method=_PASSWORD_METHOD)
+    return True, None
+
+
+def _busy():
+    resp = make_response(jsonify({"error": "Server busy, please retry."}), 503)
+    resp.headers["Retry-After"] = "1"
+    return resp
 
 
 def _issue_token(user_id: int, email: str, name: str) -> str:
@@ -86,6 +228,13 @@ def _verify_token_from_request():
     if not token:
         return None
 
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = _TOKEN_CACHE.get(digest)
+    if cached is not None:
+        version, user = cached
+        if version == _USER_VERSIONS.get(user["id"], 0):
+            return dict(user)
+
     if jwt is not None:
         try:
             secret = (current_app.config.get("SECRET_KEY") or os.environ.get(
@@ -94,33 +243,32 @@ def _verify_token_from_request():
             audience = os.environ.get("JWT_AUDIENCE", "board-game-client")
             payload = jwt.decode(token, secret, algorithms=["HS256"], issuer=issuer, audience=audience)
             user_id = int(payload.get("sub"))
+            exp = int(payload["exp"])
         except Exception:
             return None
     else:
         # Fallback token: user_id|exp
         try:
             user_id_str, exp_str = token.split("|", 1)
-            if int(exp_str) < int(datetime.now(timezone.utc).timestamp()):
+            exp = int(exp_str)
+            if exp < int(datetime.now(timezone.utc).timestamp()):
                 return None
             user_id = int(user_id_str)
         except Exception:
             return None
 
-    # Load user
-    conn = _get_db()
-    try:
-        cur = conn.execute("SELECT id, email, name FROM users WHERE id = ?", (user_id,))
-        row = cur.fetchone()
-        if row is None:
-            return None
-        return {"id": row["id"], "email": row["email"], "name": row["name"]}
-    finally:
-        conn.close()
-
-
-@bp.before_app_request
-def ensure_db():
-    _init_db()
+    # Load user; the version is read first so a concurrent invalidation
+    # makes this entry stale rather than being lost
+    version = _USER_VERSIONS.get(user_id, 0)
+    cur = _get_db().execute("SELECT id, email, name FROM users WHERE id = ?", (user_id,))
+    row = cur.fetchone()
+    if row is None:
+        return None
+    user = {"id": row["id"], "email": row["email"], "name": row["name"]}
+    ttl = exp - time.time()
+    if ttl > 0:
+        _TOKEN_CACHE.set(digest, (version, user), ttl=ttl)
+    return dict(user)
 
 
 @bp.route("/register", methods=["POST"])
@@ -137,22 +285,21 @@ def register():
             return jsonify({"error": "Password must be at least 8 characters."}), 400
 
         conn = _get_db()
-        try:
-            # Check existing
-            cur = conn.execute("SELECT id FROM users WHERE email = ?", (email,))
-            if cur.fetchone() is not None:
-                return jsonify({"error": "Email already registered."}), 409
-
-            pwd_hash = generate_password_hash(password)
-            now_iso = datetime.utcnow().isoformat() + "Z"
+        # Check existing
+        cur = conn.execute("SELECT id FROM users WHERE email = ?", (email,))
+        if cur.fetchone() is not None:
+            return jsonify({"error": "Email already registered."}), 409
+
+        pwd_hash = _run_hash(generate_password_hash, password, _PASSWORD_METHOD)
+        now_iso = datetime.utcnow().isoformat() + "Z"
+        # Commits, or rolls back so the shared connection isn't left mid-transaction
+        with conn:
             cur = conn.execute(
                 "INSERT INTO users (email, name, password_hash, created_at) VALUES (?, ?, ?, ?)",
                 (email, name, pwd_hash, now_iso),
             )
-            conn.commit()
-            user_id = cur.lastrowid
-        finally:
-            conn.close()
+        user_id = cur.lastrowid
+        _invalidate_user(user_id)
 
         token = _issue_token(user_id, email, name)
         resp = make_response(
@@ -166,6 +313,8 @@ def register():
         )
         _set_auth_cookie(resp, token)
         return resp
+    except HashQueueFull:
+        return _busy()
     except Exception as e:
         current_app.logger.exception("Registration error")
         return jsonify({"error": "Server error"}), 500
@@ -181,17 +330,18 @@ def login():
         if not email or not password:
             return jsonify({"error": "Missing email or password."}), 400
 
-        conn = _get_db()
-        try:
-            cur = conn.execute("SELECT id, email, name, password_hash FROM users WHERE email = ?", (email,))
-            row = cur.fetchone()
-        finally:
-            conn.close()
+        cur = _get_db().execute("SELECT id, email, name, password_hash FROM users WHERE email = ?", (email,))
+        row = cur.fetchone()
 
         if row is None:
             return jsonify({"error": "Invalid credentials."}), 401
-        if not check_password_hash(row["password_hash"], password):
+        matches, new_hash = _run_hash(_check_and_rehash, row["password_hash"], password)
+        if not matches:
             return jsonify({"error": "Invalid credentials."}), 401
+        if new_hash is not None:
+            with _get_db() as conn:
+                conn.execute("UPDATE users SET password_hash = ? WHERE id = ?", (new_hash, row["id"]))
+            _invalidate_user(row["id"])
 
         token = _issue_token(row["id"], row["email"], row["name"])
         resp = make_response(
@@ -204,6 +354,8 @@ def login():
         )
         _set_auth_cookie(resp, token)
         return resp
+    except HashQueueFull:
+        return _busy()
     except Exception:
         current_app.logger.exception("Login error")
         return jsonify({"error": "Server error"}), 500
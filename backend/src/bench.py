@@ -0,0 +1,1218 @@
+"""Ad-hoc performance benchmarks for the BGG backend.
+
+Run from the repository root, e.g.::
+
+    python -m backend.src.bench cache
+
+The end-to-end suite replays recorded BGG responses from ``fixtures/bgg``
+and can save its results for comparison across commits::
+
+    python -m backend.src.bench e2e --rounds 200 --output e2e.json
+    python -m backend.src.bench e2e --rounds 200 --compare e2e.json
+
+Benchmarks never touch the checked-in ``cache.db``; they work on a scratch copy
+whose rows have their expiry pushed into the future.
+"""
+import argparse
+import asyncio
+import gzip
+import heapq
+import itertools
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape as xml_escape
+
+from . import bgg
+
+
+def _scratch_cache_db(tmpdir: str) -> str:
+    path = os.path.join(tmpdir, "cache.db")
+    shutil.copyfile(bgg.CACHE_DB_PATH, path)
+    conn = sqlite3.connect(path)
+    try:
+        far = int(time.time()) + 365 * 24 * 60 * 60
+        for table in ("bgg_cache_search", "bgg_cache_thing", "bgg_cache_hot"):
+            conn.execute(f"UPDATE {table} SET expires_at = ?", (far,))
+        conn.commit()
+    finally:
+        conn.close()
+    # Bring the copy to the current schema up front so timings don't race
+    # the background migration.
+    previous = _use_cache_db(path)
+    try:
+        bgg._pc_init()
+        bgg._pc_migrate_things(path)
+    finally:
+        _use_cache_db(previous)
+    return path
+
+
+def _use_cache_db(path: str) -> str:
+    previous = bgg.CACHE_DB_PATH
+    bgg.CACHE_DB_PATH = path
+    bgg._pc_reset()
+    return previous
+
+
+def _use_users_db(path: str) -> str:
+    from . import auth
+
+    previous = auth.DB_PATH
+    auth.DB_PATH = path
+    auth._reset_db()
+    return previous
+
+
+
+
+def _stub_thing_xml(ids: List[int]) -> bytes:
+    items = []
+    for gid in ids:
+        items.append(
+            f'<item type="boardgame" id="{gid}">'
+            f'<name type="primary" sortindex="1" value="Stub Game {gid}"/>'
+            f'<yearpublished value="2000"/><minplayers value="2"/><maxplayers value="4"/>'
+            f'<minplaytime value="30"/><maxplaytime value="60"/>'
+            f'<link type="boardgamecategory" id="1" value="Strategy"/>'
+            f'<description>Stub description for {gid}.</description>'
+            f'<statistics page="1"><ratings><usersrated value="100"/><average value="7.0"/>'
+            f'<bayesaverage value="6.5"/><ranks><rank type="subtype" name="boardgame" value="{gid}"/></ranks>'
+            f'<averageweight value="2.5"/></ratings></statistics>'
+            f'</item>'
+        )
+    return ('<?xml version="1.0" encoding="utf-8"?><items>' + "".join(items) + "</items>").encode()
+
+
+def _stub_list_xml(ids: Iterable[int]) -> bytes:
+    items = "".join(f'<item type="boardgame" id="{gid}" rank="{gid}"><name type="primary" value="Stub Game {gid}"/></item>' for gid in ids)
+    return ('<?xml version="1.0" encoding="utf-8"?><items total="50">' + items + "</items>").encode()
+
+
+def _stub_response(path: str, query: Dict[str, List[str]]) -> bytes:
+    if path.endswith("/thing"):
+        ids = [int(x) for x in (query.get("id") or [""])[0].split(",") if x]
+        return _stub_thing_xml(ids)
+    if path.endswith("/search") or path.endswith("/hot"):
+        return _stub_list_xml(range(1, 51))
+    return b'<?xml version="1.0" encoding="utf-8"?><items></items>'
+
+
+def _cached_games(path: str, limit: int = 0) -> List[Dict[str, Any]]:
+    conn = sqlite3.connect(path)
+    try:
+        sql = "SELECT data FROM bgg_cache_thing ORDER BY id"
+        rows = conn.execute(sql + (f" LIMIT {int(limit)}" if limit else "")).fetchall()
+    finally:
+        conn.close()
+    return [json.loads(r[0]) for r in rows]
+
+
+def _render_thing_item(game: Dict[str, Any], publishers: int = 60) -> str:
+    # BGG-shaped <item> for a cached game, including the poll and link blocks
+    # that make real stats=1 responses large.
+    esc = xml_escape
+    attr = lambda v: xml_escape(str(v), {'"': "&quot;"})
+    players = game.get("players") or {}
+    play = game.get("time") or {}
+    stats = game.get("stats") or {}
+    max_players = int(players.get("max") or 0)
+    parts = [f'<item type="boardgame" id="{attr(game["id"])}">']
+    parts.append(f"<thumbnail>{esc(game.get('image') or '')}</thumbnail><image>{esc(game.get('image') or '')}</image>")
+    parts.append(f'<name type="primary" sortindex="1" value="{attr(game.get("name") or "")}"/>')
+    for n in range(3):
+        parts.append(f'<name type="alternate" sortindex="1" value="{attr(game.get("name") or "")} ({n})"/>')
+    parts.append(f"<description>{esc(game.get('description') or '')}</description>")
+    parts.append(f'<yearpublished value="{attr(game.get("year") or 0)}"/>')
+    parts.append(f'<minplayers value="{attr(players.get("min") or 0)}"/><maxplayers value="{attr(max_players)}"/>')
+    parts.append('<poll name="suggested_numplayers" title="User Suggested Number of Players" totalvotes="100">')
+    for n in range(1, max_players + 2):
+        parts.append(
+            f'<results numplayers="{n}"><result value="Best" numvotes="10"/>'
+            f'<result value="Recommended" numvotes="20"/><result value="Not Recommended" numvotes="5"/></results>'
+        )
+    parts.append("</poll>")
+    parts.append(f'<playingtime value="{attr(play.get("max") or 0)}"/>')
+    parts.append(f'<minplaytime value="{attr(play.get("min") or 0)}"/><maxplaytime value="{attr(play.get("max") or 0)}"/>')
+    parts.append('<minage value="10"/>')
+    for i, tag in enumerate(game.get("tags") or []):
+        parts.append(f'<link type="boardgamemechanic" id="{i}" value="{attr(tag)}"/>')
+    for i in range(publishers):
+        parts.append(f'<link type="boardgamepublisher" id="{1000 + i}" value="Publisher {i}"/>')
+    rank = stats.get("rank")
+    parts.append(
+        '<statistics page="1"><ratings>'
+        f'<usersrated value="{attr(stats.get("usersRated") or 0)}"/>'
+        f'<average value="{attr(game.get("rating") or 0)}"/>'
+        f'<bayesaverage value="{attr(stats.get("bayesAverage") or 0)}"/>'
+        '<ranks>'
+        f'<rank type="subtype" id="1" name="boardgame" friendlyname="Board Game Rank" value="{attr(rank if rank else "Not Ranked")}" bayesaverage="0"/>'
+        '<rank type="family" id="5497" name="strategygames" friendlyname="Strategy Game Rank" value="100" bayesaverage="0"/>'
+        '</ranks>'
+        '<stddev value="1.4"/><median value="0"/><owned value="1000"/><trading value="10"/>'
+        '<wanting value="10"/><wishing value="100"/><numcomments value="100"/><numweights value="50"/>'
+        f'<averageweight value="{attr(stats.get("averageWeight") or 0)}"/>'
+        '</ratings></statistics>'
+    )
+    parts.append("</item>")
+    return "".join(parts)
+
+
+def _render_thing_xml(games: List[Dict[str, Any]]) -> bytes:
+    body = "".join(_render_thing_item(g) for g in games)
+    return ('<?xml version="1.0" encoding="utf-8"?><items termsofuse="https://boardgamegeek.com/xmlapi/termsofuse">' + body + "</items>").encode()
+
+
+def _peak_alloc(fn: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class StubBGG:
+    """Local stand-in for the BGG XML API that records request arrival times."""
+
+    def __init__(self, latency: float = 0.0, responder: Optional[Callable[[str, Dict[str, List[str]]], bytes]] = None):
+        self.latency = latency
+        self.responder = responder or _stub_response
+        self.arrivals: List[float] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.arrivals.append(time.monotonic())
+                parsed = urllib.parse.urlparse(self.path)
+                body = stub.responder(parsed.path, urllib.parse.parse_qs(parsed.query))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "")
+                if gzipped:
+                    body = gzip.compress(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml; charset=utf-8")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}/xmlapi2"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        self._previous_base = bgg.BGG_BASE
+        bgg.BGG_BASE = self.base
+        return self
+
+    def __exit__(self, *exc):
+        bgg.BGG_BASE = self._previous_base
+        self.server.shutdown()
+        self.server.server_close()
+
+    def max_in_window(self, window: float) -> int:
+        times = sorted(self.arrivals)
+        best = 0
+        lo = 0
+        for hi, t in enumerate(times):
+            while t - times[lo] >= window:
+                lo += 1
+            best = max(best, hi - lo + 1)
+        return best
+
+    def min_gap(self) -> float:
+        times = sorted(self.arrivals)
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        return min(gaps) if gaps else float("inf")
+
+
+def _fresh_client(concurrency: Optional[int] = None):
+    # Drop the shared loop's client so the next request opens a new one
+    if concurrency is not None:
+        bgg._BGG_ASYNC_CONCURRENCY = concurrency
+    bgg._run_async(bgg._close_async_client())
+
+
+def _page_ids(path: str, count: int = 20) -> List[int]:
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("SELECT id FROM bgg_cache_thing WHERE has_stats = 1 ORDER BY id LIMIT ?", (count,)).fetchall()
+    finally:
+        conn.close()
+    return [int(r[0]) for r in rows]
+
+
+def _timeit(fn: Callable[[], Any], rounds: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples.sort()
+    return {
+        "rounds": rounds,
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def _legacy_get_thing(path: str, gid: int):
+    # Mirrors the original per-call pattern: fresh connection, schema DDL and
+    # expiry sweep with a commit, then the lookup.
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS bgg_cache_search (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at INTEGER NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS bgg_cache_thing (id INTEGER PRIMARY KEY, data TEXT NOT NULL, has_stats INTEGER NOT NULL, expires_at INTEGER NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS bgg_cache_hot (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at INTEGER NOT NULL)")
+        now = int(time.time())
+        conn.execute("DELETE FROM bgg_cache_search WHERE expires_at < ?", (now,))
+        conn.execute("DELETE FROM bgg_cache_thing WHERE expires_at < ?", (now,))
+        conn.execute("DELETE FROM bgg_cache_hot WHERE expires_at < ?", (now,))
+        conn.commit()
+        row = conn.execute("SELECT data, has_stats, expires_at FROM bgg_cache_thing WHERE id = ?", (gid,)).fetchone()
+        if not row:
+            return None
+        return bgg._normalize_game_payload(json.loads(row["data"]))
+    finally:
+        conn.close()
+
+
+def bench_cache(rounds: int) -> Dict[str, Any]:
+    """Hydrate a 20-id page from cache.db with the in-memory tier cold."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _scratch_cache_db(tmpdir)
+        ids = _page_ids(path)
+
+        def legacy_page():
+            return [_legacy_get_thing(path, gid) for gid in ids]
+
+        def pooled_page():
+            bgg._THING_CACHE.clear()
+            return bgg._hydrate_games(ids)
+
+        previous = _use_cache_db(path)
+        try:
+            legacy_page()
+            pooled_page()
+            before = _timeit(legacy_page, rounds)
+            after = _timeit(pooled_page, rounds)
+        finally:
+            _use_cache_db(previous)
+
+    return {"ids": len(ids), "before": before, "after": after, "speedup": before["mean_ms"] / after["mean_ms"]}
+
+
+def bench_ratelimit(rounds: int) -> Dict[str, Any]:
+    """Cold hydration of 200 ids (5 /thing chunks) against a slow local stub.
+
+    Compares one request in flight with the client's default concurrency
+    and fails if any one-second window saw more requests than the BGG
+    budget allows.
+    """
+    ids = list(range(1, 201))
+    budget = 1.0 / bgg._MIN_HTTP_INTERVAL_SEC
+    out: Dict[str, Any] = {"ids": len(ids), "budget_per_sec": budget}
+    default_concurrency = bgg._BGG_ASYNC_CONCURRENCY
+    with tempfile.TemporaryDirectory() as tmpdir:
+        previous = _use_cache_db(os.path.join(tmpdir, "empty-cache.db"))
+        try:
+            for label, concurrency in (("serial", 1), ("pooled", default_concurrency)):
+                _fresh_client(concurrency)
+                samples: List[float] = []
+                with StubBGG(latency=0.6) as stub:
+                    for _ in range(max(1, rounds)):
+                        bgg._THING_CACHE.clear()
+                        bgg._pc_conn().execute("DELETE FROM bgg_cache_thing")
+                        bgg._pc_conn().commit()
+                        start = time.perf_counter()
+                        games = bgg._hydrate_games(ids)
+                        samples.append((time.perf_counter() - start) * 1000.0)
+                        assert len(games) == len(ids), f"{label}: hydrated {len(games)} of {len(ids)}"
+                    peak = stub.max_in_window(1.0)
+                    gap = stub.min_gap()
+                # The bucket holds a single token, so no two sends may be
+                # closer than the interval (allowing for timer jitter).
+                assert peak <= int(budget) + 1, f"{label}: {peak} requests in one second"
+                assert gap >= bgg._MIN_HTTP_INTERVAL_SEC - 0.02, f"{label}: {gap:.3f}s between requests"
+                out[label] = {
+                    "concurrency": concurrency,
+                    "mean_ms": statistics.fmean(samples),
+                    "requests": len(stub.arrivals),
+                    "max_per_1s_window": peak,
+                    "min_gap_ms": gap * 1000.0,
+                }
+        finally:
+            _fresh_client(default_concurrency)
+            _use_cache_db(previous)
+    out["speedup"] = out["serial"]["mean_ms"] / out["pooled"]["mean_ms"]
+    return out
+
+
+def bench_http(rounds: int) -> Dict[str, Any]:
+    """Sequential /thing requests to a local stub: urlopen vs the pooled client."""
+    previous_limiter = bgg._BGG_RATE_LIMITER
+    bgg._BGG_RATE_LIMITER = bgg.TokenBucket(rate=1e6, capacity=1e6)
+    _fresh_client()
+    try:
+        with StubBGG() as stub:
+            url = f"{stub.base}/thing?id={','.join(str(i) for i in range(1, 41))}&stats=1"
+
+            def urlopen_get():
+                # The previous _http_get: a new connection per call, no gzip
+                req = urllib.request.Request(url, headers={"Connection": "keep-alive"})
+                with urllib.request.urlopen(req, timeout=10) as resp:
+                    data = resp.read()
+                bgg.ET.fromstring(bgg._maybe_decompress(data))
+                return data
+
+            def pooled_get():
+                root = bgg._run_async(bgg._get_xml_async(url, tries=1))
+                assert root is not None and len(root.findall("item")) == 40
+                return root
+
+            before = _timeit(urlopen_get, rounds)
+            after = _timeit(pooled_get, rounds)
+            raw_bytes = len(urlopen_get())
+            wire_bytes = len(bgg._http_get(url))
+            pool = bgg._http_client_stats()
+    finally:
+        bgg._BGG_RATE_LIMITER = previous_limiter
+        _fresh_client()
+    return {
+        "urlopen": before,
+        "pooled": after,
+        "pool": pool,
+        "body_bytes": raw_bytes,
+        "gzip_bytes": wire_bytes,
+    }
+
+
+def bench_parse(rounds: int) -> Dict[str, Any]:
+    """Parse a gzipped 40-item /thing response rendered from cached games."""
+    games = _cached_games(bgg.CACHE_DB_PATH, limit=40)
+    raw = _render_thing_xml(games)
+    body = gzip.compress(raw)
+
+    def tree_parse():
+        root = bgg._parse_xml_root(body)
+        return [bgg._parse_thing_item(item) for item in root.findall("item")]
+
+    def stream_parse():
+        return [bgg._parse_thing_item(item) for item in bgg._stream_xml_items(body)]
+
+    assert tree_parse() == stream_parse()
+    return {
+        "items": len(games),
+        "xml_bytes": len(raw),
+        "gzip_bytes": len(body),
+        "tree": dict(_timeit(tree_parse, rounds), peak_bytes=_peak_alloc(tree_parse)),
+        "stream": dict(_timeit(stream_parse, rounds), peak_bytes=_peak_alloc(stream_parse)),
+    }
+
+
+def bench_coalesce(rounds: int) -> Dict[str, Any]:
+    """Concurrent cold requests for the same search, hot list and page of ids."""
+    threads_per_round = 8
+    out: Dict[str, Any] = {"threads": threads_per_round}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        previous = _use_cache_db(os.path.join(tmpdir, "empty-cache.db"))
+        try:
+            with StubBGG(latency=0.3) as stub:
+                for r in range(max(1, rounds)):
+                    bgg._SEARCH_CACHE.clear()
+                    bgg._HOT_IDS_CACHE.clear()
+                    bgg._THING_CACHE.clear()
+                    conn = bgg._pc_conn()
+                    for table in ("bgg_cache_search", "bgg_cache_thing", "bgg_cache_hot"):
+                        conn.execute(f"DELETE FROM {table}")
+                    conn.commit()
+
+                    def worker():
+                        bgg._get_search_ids(f"stub query {r}")
+                        bgg._get_hot_ids("boardgame")
+                        bgg._hydrate_games(list(range(1, 21)))
+
+                    threads = [threading.Thread(target=worker) for _ in range(threads_per_round)]
+                    for t in threads:
+                        t.start()
+                    for t in threads:
+                        t.join()
+                out["upstream_requests"] = len(stub.arrivals)
+                out["rounds"] = max(1, rounds)
+        finally:
+            _use_cache_db(previous)
+    out["singleflight"] = bgg._BGG_INFLIGHT.stats()
+    return out
+
+
+class _LegacyTTLCache:
+    # The original TTLCache: full expiry scan on every get/set, no lock
+    def __init__(self, capacity: int, default_ttl: float):
+        self.capacity = capacity
+        self.default_ttl = default_ttl
+        self.data: "OrderedDict[Any, Any]" = OrderedDict()
+
+    def _purge(self):
+        now = time.time()
+        expired = [k for k, (exp, _) in self.data.items() if exp < now]
+        for k in expired:
+            self.data.pop(k, None)
+        while len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+
+    def get(self, key):
+        self._purge()
+        item = self.data.get(key)
+        if not item:
+            return None
+        exp, val = item
+        if exp < time.time():
+            self.data.pop(key, None)
+            return None
+        self.data.move_to_end(key, last=True)
+        return val
+
+    def set(self, key, val, ttl=None):
+        exp = time.time() + (ttl if ttl is not None else self.default_ttl)
+        self.data[key] = (exp, val)
+        self.data.move_to_end(key, last=True)
+        self._purge()
+
+
+def bench_ttlcache(rounds: int) -> Dict[str, Any]:
+    """Per-operation get/set cost with a cache at _THING_CACHE capacity."""
+    capacity = 4096
+    ops = 2000
+    out: Dict[str, Any] = {"capacity": capacity, "ops_per_round": ops}
+    for label, cls in (("legacy", _LegacyTTLCache), ("heap", bgg.TTLCache)):
+        cache = cls(capacity=capacity, default_ttl=24 * 60 * 60)
+        for i in range(capacity):
+            cache.set(i, {"id": i})
+        counter = itertools.count(capacity)
+
+        def gets():
+            for i in range(ops):
+                cache.get(i % capacity)
+
+        def sets():
+            for _ in range(ops):
+                i = next(counter)
+                cache.set(i, {"id": i})
+
+        get_stats = _timeit(gets, rounds)
+        set_stats = _timeit(sets, rounds)
+        out[label] = {
+            "get_us": get_stats["mean_ms"] * 1000.0 / ops,
+            "set_us": set_stats["mean_ms"] * 1000.0 / ops,
+        }
+    out["stats"] = cache.stats()
+    return out
+
+
+def _vacuumed_size(path: str) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return os.path.getsize(path)
+
+
+def bench_storage(rounds: int) -> Dict[str, Any]:
+    """cache.db size and per-page decode time: JSON rows vs the compact layout."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy_path = os.path.join(tmpdir, "legacy.db")
+        shutil.copyfile(bgg.CACHE_DB_PATH, legacy_path)
+        compact_path = _scratch_cache_db(tmpdir)
+        ids = _page_ids(compact_path)
+        rows = len(_cached_games(legacy_path))
+
+        legacy_conn = sqlite3.connect(legacy_path)
+        placeholders = ",".join("?" * len(ids))
+
+        def legacy_page():
+            cur = legacy_conn.execute(f"SELECT id, data FROM bgg_cache_thing WHERE id IN ({placeholders})", ids)
+            return [json.loads(data) for _, data in cur.fetchall()]
+
+        previous = _use_cache_db(compact_path)
+        try:
+            assert len(bgg._pc_get_things(ids)) == len(ids)
+            before = _timeit(legacy_page, rounds)
+            after = _timeit(lambda: bgg._pc_get_things(ids), rounds)
+        finally:
+            _use_cache_db(previous)
+            legacy_conn.close()
+
+        return {
+            "rows": rows,
+            "page_ids": len(ids),
+            "json_rows": dict(before, db_bytes=_vacuumed_size(legacy_path)),
+            "compact_rows": dict(after, db_bytes=_vacuumed_size(compact_path)),
+        }
+
+
+def _synthetic_corpus(size: int) -> List[Dict[str, Any]]:
+    # Cached games repeated under fresh ids, with tags and numbers jittered
+    # so rows aren't identical copies.
+    base = _cached_games(bgg.CACHE_DB_PATH, limit=1000)
+    vocab = sorted({tag for game in base for tag in game.get("tags") or []})
+    rng = random.Random(7)
+    corpus: List[Dict[str, Any]] = []
+    for i in range(size):
+        game = dict(base[i % len(base)])
+        game["id"] = str(1_000_000 + i)
+        game["tags"] = rng.sample(vocab, min(len(vocab), rng.randint(3, 12)))
+        if game.get("rating"):
+            game["rating"] = round(min(10.0, max(1.0, game["rating"] + rng.uniform(-1, 1))), 2)
+        corpus.append(game)
+    return corpus
+
+
+def bench_features(rounds: int) -> Dict[str, Any]:
+    """Score a 100k-game corpus per /similar query: NumPy matrix vs Python loop."""
+    if bgg.np is None:
+        return {"skipped": "numpy is not installed"}
+    size = 100_000
+    corpus = _synthetic_corpus(size)
+    matrix = bgg.FeatureMatrix()
+    matrix._loaded = True
+    start = time.perf_counter()
+    matrix.update(corpus)
+    build_ms = (time.perf_counter() - start) * 1000.0
+
+    queries = itertools.cycle(corpus[:: size // 50])
+
+    def vectorized():
+        game = next(queries)
+        matrix.top_k(matrix.similarity_scores(game), 10, exclude=(int(game["id"]),))
+
+    def python_loop():
+        game = next(queries)
+        heapq.nlargest(10, (bgg._similarity(game, other)[0] for other in corpus if other is not game))
+
+    update = itertools.count()
+
+    def incremental():
+        game = dict(corpus[next(update) % size], rating=7.5)
+        matrix.update([game])
+
+    return {
+        "games": size,
+        "tags": matrix.stats()["tags"],
+        "build_ms": build_ms,
+        "matrix_bytes": int(matrix.dense.nbytes + matrix.tags.nbytes + matrix.ids.nbytes),
+        "numpy_query": _timeit(vectorized, rounds),
+        "python_query": _timeit(python_loop, max(1, min(rounds, 3))),
+        "incremental_update": _timeit(incremental, rounds),
+    }
+
+
+def bench_wire(rounds: int) -> Dict[str, Any]:
+    """/hot page: bytes on the wire with and without gzip, and JSON
+    serialization time for each provider."""
+    from flask.json.provider import DefaultJSONProvider
+
+    from . import index
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _scratch_cache_db(tmpdir)
+        previous = _use_cache_db(path)
+        try:
+            client = index.app.test_client()
+            with StubBGG():
+                plain = client.get("/api/bgg/hot?limit=20&page=1")
+                gzipped = client.get("/api/bgg/hot?limit=20&page=1", headers={"Accept-Encoding": "gzip"})
+                payload = plain.get_json()
+
+                def request_plain():
+                    bgg._bump_generation()
+                    client.get("/api/bgg/hot?limit=20&page=1")
+
+                def request_gzip():
+                    bgg._bump_generation()
+                    client.get("/api/bgg/hot?limit=20&page=1", headers={"Accept-Encoding": "gzip"})
+
+                out: Dict[str, Any] = {
+                    "games": len(payload["results"]),
+                    "identity_bytes": len(plain.get_data()),
+                    "gzip_bytes": len(gzipped.get_data()),
+                    "provider": type(index.app.json).__name__,
+                    "request_identity": _timeit(request_plain, rounds),
+                    "request_gzip": _timeit(request_gzip, rounds),
+                }
+        finally:
+            _use_cache_db(previous)
+
+    providers = [("stdlib", DefaultJSONProvider(index.app))]
+    if index.orjson is not None:
+        providers.append(("orjson", index.ORJSONProvider(index.app)))
+    with index.app.app_context():
+        for label, provider in providers:
+            out[f"serialize_{label}"] = _timeit(lambda: provider.response(payload).get_data(), rounds)
+    out["gzip_compress"] = _timeit(lambda: gzip.compress(plain.get_data(), compresslevel=index.GZIP_LEVEL), rounds)
+    return out
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+    }
+
+
+async def _asgi_get(app: Callable[..., Any], target: str) -> int:
+    path, _, query = target.partition("?")
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode("latin-1"),
+        "headers": [],
+    }
+    status: List[int] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+def bench_async(rounds: int) -> Dict[str, Any]:
+    """Load test: cold searches against a slow stub mixed with warm /hot pages,
+    on 4 sync worker threads vs the ASGI app on one event loop. Latency is
+    measured from submission, so time spent queued for a worker counts."""
+    from . import asgi
+    from . import index
+
+    workers, cold, warm, latency = 4, 8, 16, 0.5
+    previous_limiter = bgg._BGG_RATE_LIMITER
+    bgg._BGG_RATE_LIMITER = bgg.TokenBucket(rate=1e6, capacity=1e6)
+    out: Dict[str, Any] = {"workers": workers, "cold_requests": cold, "warm_requests": warm, "upstream_latency_s": latency}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = _scratch_cache_db(tmpdir)
+        previous = _use_cache_db(path)
+        try:
+            with StubBGG(latency=latency) as stub:
+                warm_targets = [f"/api/bgg/hot?limit=10&page={i % 5 + 1}" for i in range(warm)]
+                client = index.app.test_client()
+                for target in set(warm_targets):
+                    client.get(target)
+
+                def plan(label: str) -> List[str]:
+                    bgg._bump_generation()
+                    # Cold searches go first so they occupy the workers
+                    return [f"/api/bgg/search?q={label}+{i}" for i in range(cold)] + warm_targets
+
+                def sync_round(label: str) -> Dict[str, List[float]]:
+                    timings: Dict[str, List[float]] = {"cold": [], "warm": []}
+                    start = time.perf_counter()
+
+                    def call(target: str):
+                        resp = index.app.test_client().get(target)
+                        assert resp.status_code == 200, resp.status_code
+                        kind = "cold" if "/search" in target else "warm"
+                        timings[kind].append((time.perf_counter() - start) * 1000.0)
+
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        list(pool.map(call, plan(label)))
+                    timings["total"] = [(time.perf_counter() - start) * 1000.0]
+                    return timings
+
+                async def async_round(label: str) -> Dict[str, List[float]]:
+                    timings: Dict[str, List[float]] = {"cold": [], "warm": []}
+                    start = time.perf_counter()
+
+                    async def call(target: str):
+                        status = await _asgi_get(asgi.app, target)
+                        assert status == 200, status
+                        kind = "cold" if "/search" in target else "warm"
+                        timings[kind].append((time.perf_counter() - start) * 1000.0)
+
+                    await asyncio.gather(*(call(t) for t in plan(label)))
+                    timings["total"] = [(time.perf_counter() - start) * 1000.0]
+                    return timings
+
+                for label, run in (
+                    ("sync", sync_round),
+                    ("async", lambda name: asyncio.run(async_round(name))),
+                ):
+                    merged: Dict[str, List[float]] = {"cold": [], "warm": [], "total": []}
+                    for r in range(max(1, rounds)):
+                        for kind, samples in run(f"{label}{r}").items():
+                            merged[kind].extend(samples)
+                    out[label] = {kind: _percentiles(samples) for kind, samples in merged.items()}
+                out["upstream_requests"] = len(stub.arrivals)
+        finally:
+            _use_cache_db(previous)
+            bgg._BGG_RATE_LIMITER = previous_limiter
+    return out
+
+
+def bench_auth(rounds: int) -> Dict[str, Any]:
+    """Per-request overhead of /api/auth/me and a cached /api/bgg/hot page:
+    the old schema check on every request plus a connection per auth query,
+    vs startup migration and thread-local connections. ``me_uncached``
+    and ``verify_uncached`` clear the verified-token cache before each call."""
+    from . import auth
+    from . import index
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_path = _scratch_cache_db(tmpdir)
+        previous_cache = _use_cache_db(cache_path)
+        previous_users = _use_users_db(os.path.join(tmpdir, "users.db"))
+        legacy = {"on": False}
+
+        def legacy_ensure_db():
+            # The removed before_app_request hook
+            if legacy["on"]:
+                conn = sqlite3.connect(auth.DB_PATH)
+                try:
+                    conn.execute(auth._MIGRATIONS[0])
+                    conn.commit()
+                finally:
+                    conn.close()
+
+        def legacy_get_db():
+            conn = sqlite3.connect(auth.DB_PATH)
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        pooled_get_db = auth._get_db
+        index.app.before_request_funcs.setdefault(None, []).insert(0, legacy_ensure_db)
+        try:
+            client = index.app.test_client()
+            resp = client.post(
+                "/api/auth/register",
+                json={"name": "Bench", "email": "bench@example.com", "password": "benchmark-password"},
+            )
+            assert resp.status_code == 201, resp.status_code
+            with StubBGG():
+                client.get("/api/bgg/hot?limit=20")
+
+                def me():
+                    assert client.get("/api/auth/me").status_code == 200
+
+                def hot():
+                    assert client.get("/api/bgg/hot?limit=20").status_code == 200
+
+                out: Dict[str, Any] = {}
+                for label, get_db in (("before", legacy_get_db), ("after", pooled_get_db)):
+                    legacy["on"] = label == "before"
+                    auth._get_db = get_db
+                    me()
+                    out[label] = {"me": _timeit(me, rounds), "hot": _timeit(hot, rounds)}
+
+                def me_uncached():
+                    auth._TOKEN_CACHE.clear()
+                    me()
+
+                out["after"]["me_uncached"] = _timeit(me_uncached, rounds)
+                token = client.get_cookie("token").value
+                with index.app.test_request_context(headers={"Cookie": f"token={token}"}):
+                    out["verify_cached"] = _timeit(auth._verify_token_from_request, rounds)
+                    out["verify_uncached"] = _timeit(
+                        lambda: (auth._TOKEN_CACHE.clear(), auth._verify_token_from_request()), rounds
+                    )
+                out["token_cache"] = auth._TOKEN_CACHE.stats()
+        finally:
+            auth._get_db = pooled_get_db
+            index.app.before_request_funcs[None].remove(legacy_ensure_db)
+            _use_users_db(previous_users)
+            _use_cache_db(previous_cache)
+    return out
+
+
+def bench_loginstorm(rounds: int) -> Dict[str, Any]:
+    """Latency of a cached /api/bgg/hot page while 16 threads log in as fast
+    as they can: hashing on the request threads vs the bounded hash pool
+    (1 worker, queue depth 4). ``rounds`` is the number of probe requests."""
+    from . import auth
+    from . import index
+
+    storm_threads, workers, queue = 16, 1, 4
+    credentials = {"name": "Bench", "email": "bench@example.com", "password": "benchmark-password"}
+    out: Dict[str, Any] = {"storm_threads": storm_threads, "hash_workers": workers, "hash_queue": queue}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        previous_cache = _use_cache_db(_scratch_cache_db(tmpdir))
+        previous_users = _use_users_db(os.path.join(tmpdir, "users.db"))
+        pooled_run_hash = auth._run_hash
+        previous_pool, previous_slots = auth._HASH_POOL, auth._HASH_SLOTS
+        auth._HASH_POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth-hash")
+        auth._HASH_SLOTS = threading.BoundedSemaphore(workers + queue)
+        try:
+            client = index.app.test_client()
+            assert client.post("/api/auth/register", json=credentials).status_code == 201
+            with StubBGG():
+                client.get("/api/bgg/hot?limit=20")
+
+                def probe():
+                    assert client.get("/api/bgg/hot?limit=20").status_code == 200
+
+                out["idle"] = _timeit(probe, rounds)
+                for label, run_hash in (
+                    ("inline", lambda fn, *args: fn(*args)),
+                    ("pooled", pooled_run_hash),
+                ):
+                    auth._run_hash = run_hash
+                    stop = threading.Event()
+                    statuses: List[int] = []
+
+                    def storm():
+                        storm_client = index.app.test_client()
+                        while not stop.is_set():
+                            status = storm_client.post("/api/auth/login", json=credentials).status_code
+                            statuses.append(status)
+                            if status == 503:
+                                # Clients back off on 503 rather than spin
+                                time.sleep(0.1)
+
+                    threads = [threading.Thread(target=storm) for _ in range(storm_threads)]
+                    for t in threads:
+                        t.start()
+                    time.sleep(0.5)
+                    start = time.perf_counter()
+                    timing = _timeit(probe, rounds)
+                    elapsed = time.perf_counter() - start
+                    stop.set()
+                    for t in threads:
+                        t.join()
+                    ok = statuses.count(200)
+                    timing.update({
+                        "logins_ok": ok,
+                        "logins_503": statuses.count(503),
+                        "logins_per_s": ok / (elapsed + 0.5),
+                    })
+                    out[label] = timing
+        finally:
+            auth._run_hash = pooled_run_hash
+            auth._HASH_POOL.shutdown(wait=True)
+            auth._HASH_POOL, auth._HASH_SLOTS = previous_pool, previous_slots
+            _use_users_db(previous_users)
+            _use_cache_db(previous_cache)
+    return out
+
+
+# Recorded BGG responses for the end-to-end suite: hot.xml, search-<query>.xml
+# and thing.xml (every game the lists mention, stats=1). Re-record with
+# ``python -m backend.src.bench record-fixtures [--live]``.
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "bgg")
+FIXTURE_QUERIES = ("catan",)
+
+
+def _fixture_slug(query: str) -> str:
+    return "".join(c if c.isalnum() else "-" for c in query.strip().lower())
+
+
+def _xml_items(items: Iterable[str]) -> bytes:
+    return ('<?xml version="1.0" encoding="utf-8"?>\n<items>\n' + "\n".join(items) + "\n</items>\n").encode()
+
+
+def record_fixtures(live: bool = False) -> Dict[str, Any]:
+    """Write the fixtures from the live BGG API, or (default) render them
+    from the games in the checked-in cache.db, keeping list entries whose
+    /thing data is available."""
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    lists: Dict[str, List[str]] = {}
+    things: Dict[int, str] = {}
+    if live:
+        def fetch(url: str) -> List[bgg.ET.Element]:
+            return bgg.ET.fromstring(bgg._maybe_decompress(bgg._http_get(url))).findall("item")
+
+        wanted: List[int] = []
+        lists["hot"] = [bgg.ET.tostring(item, encoding="unicode") for item in fetch(bgg._hot_url("boardgame"))]
+        wanted += bgg._parse_hot_ids(bgg.ET.fromstring(_xml_items(lists["hot"])))
+        for query in FIXTURE_QUERIES:
+            items = fetch(bgg._search_url(query))
+            lists[f"search-{_fixture_slug(query)}"] = [bgg.ET.tostring(item, encoding="unicode") for item in items]
+            wanted += [int(item.get("id")) for item in items if item.get("id")]
+        for url in bgg._thing_urls(bgg._dedupe_preserve(wanted), batch_size=20):
+            for item in fetch(url):
+                things[int(item.get("id"))] = bgg.ET.tostring(item, encoding="unicode")
+    else:
+        conn = sqlite3.connect(bgg.CACHE_DB_PATH)
+        try:
+            hot = json.loads(conn.execute("SELECT value FROM bgg_cache_hot WHERE key = 'hot:boardgame'").fetchone()[0])
+            searches = {
+                query: json.loads(conn.execute("SELECT value FROM bgg_cache_search WHERE key = ?", (query,)).fetchone()[0])
+                for query in FIXTURE_QUERIES
+            }
+        finally:
+            conn.close()
+        games = {int(g["id"]): g for g in _cached_games(bgg.CACHE_DB_PATH) if g.get("stats")}
+        attr = lambda v: xml_escape(str(v), {'"': "&quot;"})
+
+        def list_item(gid: int, rank: int) -> str:
+            game = games[gid]
+            return (
+                f'<item type="boardgame" id="{gid}" rank="{rank}">'
+                f'<name type="primary" value="{attr(game.get("name") or "")}"/>'
+                f'<yearpublished value="{attr(game.get("year") or 0)}"/></item>'
+            )
+
+        lists["hot"] = [list_item(gid, n) for n, gid in enumerate((g for g in hot if g in games), 1)]
+        for query, ids in searches.items():
+            lists[f"search-{_fixture_slug(query)}"] = [list_item(gid, n) for n, gid in enumerate((g for g in ids if g in games), 1)]
+        for gid in sorted({i for ids in [hot, *searches.values()] for i in ids if i in games}):
+            things[gid] = _render_thing_item(games[gid], publishers=8)
+
+    written = {}
+    for name, items in [*lists.items(), ("thing", [things[k] for k in sorted(things)])]:
+        path = os.path.join(FIXTURES_DIR, f"{name}.xml")
+        with open(path, "wb") as fh:
+            fh.write(_xml_items(items))
+        written[name] = len(items)
+    return written
+
+
+class FixtureBGG(StubBGG):
+    """StubBGG serving the recorded fixtures. /thing answers with the
+    recorded items for the requested ids, like BGG does."""
+
+    def __init__(self, latency: float = 0.0):
+        self.things: Dict[int, str] = {}
+        root = bgg.ET.parse(os.path.join(FIXTURES_DIR, "thing.xml")).getroot()
+        for item in root.findall("item"):
+            self.things[int(item.get("id"))] = bgg.ET.tostring(item, encoding="unicode")
+        with open(os.path.join(FIXTURES_DIR, "hot.xml"), "rb") as fh:
+            self.hot = fh.read()
+        super().__init__(latency=latency, responder=self._respond)
+
+    def _respond(self, path: str, query: Dict[str, List[str]]) -> bytes:
+        if path.endswith("/thing"):
+            ids = [int(x) for x in (query.get("id") or [""])[0].split(",") if x]
+            return _xml_items(self.things[gid] for gid in ids if gid in self.things)
+        if path.endswith("/hot"):
+            return self.hot
+        if path.endswith("/search"):
+            fixture = os.path.join(FIXTURES_DIR, f"search-{_fixture_slug((query.get('query') or [''])[0])}.xml")
+            if os.path.exists(fixture):
+                with open(fixture, "rb") as fh:
+                    return fh.read()
+        return _xml_items([])
+
+
+class _SQLiteCounter:
+    """Counts statements on every cache.db connection opened while installed."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._open = bgg._pc_open
+
+    def _trace(self, _statement: str):
+        with self._lock:
+            self.count += 1
+
+    def _traced_open(self, path: str) -> sqlite3.Connection:
+        conn = self._open(path)
+        conn.set_trace_callback(self._trace)
+        return conn
+
+    def __enter__(self):
+        bgg._pc_open = self._traced_open
+        return self
+
+    def __exit__(self, *exc):
+        bgg._pc_open = self._open
+
+
+def _drop_memory_caches():
+    # Everything a restarted process wouldn't have; cache.db is untouched
+    for cache in (bgg._SEARCH_CACHE, bgg._THING_CACHE, bgg._HOT_IDS_CACHE, bgg._RESPONSE_CACHE):
+        cache.clear()
+    bgg._TAG_INDEX.clear()
+    bgg._SIMILAR_INDEX.clear()
+    if bgg._FEATURE_MATRIX is not None:
+        bgg._FEATURE_MATRIX.clear()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(__file__), capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+E2E_REQUESTS: Dict[str, str] = {
+    "hot": "/api/bgg/hot?limit=20",
+    "hot_filtered": "/api/bgg/hot?limit=20&players=4&max_time=90&tags=hand-management",
+    "search": "/api/bgg/search?q=catan&limit=20",
+    "search_filtered": "/api/bgg/search?q=catan&limit=20&players=4&max_time=90&tags=hand-management",
+}
+E2E_STATES = ("cold", "cache_db_warm", "memory_warm")
+
+
+def bench_e2e(rounds: int) -> Dict[str, Any]:
+    """/api/bgg/hot and /api/bgg/search through the Flask test client against
+    the recorded fixtures, with and without filters, in three states:
+
+    - cold: empty cache.db and memory caches; everything comes from "BGG"
+    - cache_db_warm: cache.db populated, memory caches dropped per request
+    - memory_warm: in-memory caches populated; only the serialized response
+      cache is dropped, so every request runs the handler
+
+    Reports p50/p95/p99 and the mean/max SQLite statements and upstream HTTP
+    requests per request. The rate limiter is disabled so cold timings
+    measure the backend rather than the BGG politeness delay.
+    """
+    from . import index
+
+    previous_limiter = bgg._BGG_RATE_LIMITER
+    bgg._BGG_RATE_LIMITER = bgg.TokenBucket(rate=1e6, capacity=1e6)
+    scenarios: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        previous = _use_cache_db(os.path.join(tmpdir, "unused.db"))
+        try:
+            client = index.app.test_client()
+            with FixtureBGG() as stub, _SQLiteCounter() as sql:
+                for name, target in E2E_REQUESTS.items():
+                    warm_path = os.path.join(tmpdir, f"{name}-warm.db")
+                    for state in E2E_STATES:
+                        samples: List[float] = []
+                        queries: List[int] = []
+                        fetches: List[int] = []
+                        for r in range(max(1, rounds)):
+                            if state == "cold":
+                                _use_cache_db(os.path.join(tmpdir, f"{name}-cold-{r}.db"))
+                                bgg._pc_conn()
+                                _drop_memory_caches()
+                            elif r == 0:
+                                # One untimed request populates cache.db / memory
+                                _use_cache_db(warm_path)
+                                _drop_memory_caches()
+                                client.get(target)
+                            if state == "cache_db_warm":
+                                _drop_memory_caches()
+                            elif state == "memory_warm":
+                                bgg._RESPONSE_CACHE.clear()
+                            sql_before, http_before = sql.count, len(stub.arrivals)
+                            start = time.perf_counter()
+                            resp = client.get(target)
+                            samples.append((time.perf_counter() - start) * 1000.0)
+                            assert resp.status_code == 200, (target, resp.status_code)
+                            queries.append(sql.count - sql_before)
+                            fetches.append(len(stub.arrivals) - http_before)
+                            if state == "cold":
+                                # Don't leave the per-round connection open
+                                _use_cache_db(warm_path)
+                        samples.sort()
+                        scenarios[f"{name}/{state}"] = {
+                            "target": target,
+                            "rounds": len(samples),
+                            "results": len(resp.get_json().get("results") or []),
+                            "p50_ms": samples[int(0.50 * (len(samples) - 1))],
+                            "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+                            "p99_ms": samples[int(0.99 * (len(samples) - 1))],
+                            "sqlite_statements": {"mean": statistics.fmean(queries), "max": max(queries)},
+                            "http_requests": {"mean": statistics.fmean(fetches), "max": max(fetches)},
+                        }
+        finally:
+            _use_cache_db(previous)
+            bgg._BGG_RATE_LIMITER = previous_limiter
+    return {
+        "commit": _git_commit(),
+        "timestamp": int(time.time()),
+        "rounds": max(1, rounds),
+        "json_provider": type(index.app.json).__name__,
+        "scenarios": scenarios,
+    }
+
+
+def _compare(baseline: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    # p50/p95 ratios (current / baseline) for scenarios present in both runs
+    out: Dict[str, Any] = {}
+    for key, current in (result.get("scenarios") or {}).items():
+        before = (baseline.get("scenarios") or {}).get(key)
+        if not before:
+            continue
+        out[key] = {
+            f"{p}_ratio": current[p] / before[p] if before[p] else None for p in ("p50_ms", "p95_ms")
+        }
+    return out
+
+
+BENCHMARKS: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "cache": bench_cache,
+    "ratelimit": bench_ratelimit,
+    "http": bench_http,
+    "parse": bench_parse,
+    "coalesce": bench_coalesce,
+    "ttlcache": bench_ttlcache,
+    "storage": bench_storage,
+    "features": bench_features,
+    "wire": bench_wire,
+    "async": bench_async,
+    "auth": bench_auth,
+    "loginstorm": bench_loginstorm,
+    "e2e": bench_e2e,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Board game library backend benchmarks")
+    parser.add_argument("name", choices=sorted(BENCHMARKS) + ["record-fixtures"], help="benchmark to run")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--compare", help="JSON result of an earlier run to report p50/p95 ratios against")
+    parser.add_argument("--live", action="store_true", help="record-fixtures: fetch from BGG instead of cache.db")
+    args = parser.parse_args(argv)
+
+    if args.name == "record-fixtures":
+        print(json.dumps(record_fixtures(live=args.live), indent=2))
+        return
+
+    result = BENCHMARKS[args.name](args.rounds)
+    if args.compare:
+        with open(args.compare) as fh:
+            result["compare"] = _compare(json.load(fh), result)
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(result, fh, indent=2)
+            fh.write("\n")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,288 +1,1825 @@
+import asyncio
+import base64
+import binascii
+import functools
+import hashlib
 import math
+import random
 import time
 import urllib.parse
-import urllib.request
 import urllib.error
 import xml.etree.ElementTree as ET
 import gzip
+import heapq
+import io
 import zlib
-from typing import Dict, List, Optional, Any, Tuple, Iterable, Set
+from typing import IO, Awaitable, Callable, Dict, List, Optional, Any, Tuple, Iterable, Iterator, Set, TypeVar
 import os
 import sqlite3
+import threading
 import json
 import html
 import re
+import ssl
+from concurrent.futures import ThreadPoolExecutor
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, make_response, request
+
+from .ttlcache import TTLCache
+
+try:
+    import numpy as np
+except ImportError:  # optional: /similar falls back to LSH candidates
+    np = None
 
 
 bp = Blueprint("bgg", __name__, url_prefix="/api/bgg")
 
+T = TypeVar("T")
+
 
 BGG_BASE = "https://boardgamegeek.com/xmlapi2"
 
+
+class Metrics:
+    """Minimal in-process counters and histograms in Prometheus text format.
+
+    Each update is a dict lookup and an add under one lock, cheap enough to
+    leave on in production.
+    """
+
+    _LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    _SIZE_BUCKETS = (0, 1, 5, 10, 20, 40, 100)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}
+
+    def counter(self, name: str, help_text: str):
+        self._help[name] = ("counter", help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = _LATENCY_BUCKETS):
+        self._help[name] = ("histogram", help_text)
+        self._buckets[name] = buckets
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        buckets = self._buckets[name]
+        with self._lock:
+            slots = self._histograms.get(key)
+            if slots is None:
+                # one slot per bucket, then +Inf, sum
+                slots = self._histograms[key] = [0.0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    slots[i] += 1
+                    break
+            else:
+                slots[len(buckets)] += 1
+            slots[-1] += value
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _labels(pairs: Iterable[Tuple[str, Any]]) -> str:
+        parts = [f'{k}="{str(v)}"' for k, v in pairs]
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self, collected: Iterable[Tuple[str, str, str, Dict[str, Any], float]] = ()) -> str:
+        # ``collected`` holds (name, type, help, labels, value) samples read
+        # from other components at scrape time.
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+        lines: List[str] = []
+        for name, (kind, help_text) in sorted(self._help.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (cname, labels), value in sorted(counters.items()):
+                    if cname == name:
+                        lines.append(f"{name}{self._labels(labels)} {value:g}")
+                continue
+            buckets = self._buckets[name]
+            for (hname, labels), slots in sorted(histograms.items()):
+                if hname != name:
+                    continue
+                running = 0.0
+                for bound, count in zip(buckets, slots):
+                    running += count
+                    lines.append(f"{name}_bucket{self._labels(labels + (('le', f'{bound:g}'),))} {running:g}")
+                running += slots[len(buckets)]
+                lines.append(f"{name}_bucket{self._labels(labels + (('le', '+Inf'),))} {running:g}")
+                lines.append(f"{name}_sum{self._labels(labels)} {slots[-1]:g}")
+                lines.append(f"{name}_count{self._labels(labels)} {running:g}")
+        seen: Set[str] = set()
+        for name, kind, help_text, labels, value in collected:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{self._labels(sorted(labels.items()))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+_METRICS = Metrics()
+_METRICS.counter("bgg_cache_lookups_total", "Cache lookups by kind (search/thing/hot), tier (memory/db) and result.")
+_METRICS.counter("bgg_upstream_requests_total", "Requests sent to the BGG XML API.")
+_METRICS.counter("bgg_upstream_errors_total", "Failed BGG attempts by error type (queued, http, network, parse).")
+_METRICS.counter("bgg_upstream_retries_total", "BGG attempts retried after a backoff sleep.")
+_METRICS.counter("bgg_ratelimit_sleep_seconds_total", "Time spent waiting on the BGG rate limiter.")
+_METRICS.counter("bgg_ratelimit_waits_total", "Rate limiter acquisitions that had to sleep.")
+_METRICS.counter("bgg_response_cache_total", "Conditional GET handling by endpoint and result (hit/miss/not_modified).")
+_METRICS.histogram("bgg_upstream_request_seconds", "BGG HTTP round trip latency, excluding rate-limit waits.")
+_METRICS.histogram("bgg_xml_parse_seconds", "Time spent parsing BGG XML responses.")
+_METRICS.histogram("bgg_hydrate_batch_size", "Ids per _hydrate_games call by stage (requested/db/fetched).", Metrics._SIZE_BUCKETS)
+
+
+def _bgg_endpoint(url: str) -> str:
+    name = urllib.parse.urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+    return name if name in {"thing", "search", "hot"} else "other"
+
+
+class BGGQueuedError(RuntimeError):
+    """BGG accepted the request but answered with a 'queued/processing' message."""
+
 # Client-side rate limiting for BGG calls
-_LAST_HTTP_TS: float = 0.0
 _MIN_HTTP_INTERVAL_SEC: float = 0.35  # ~3 req/sec
+_BGG_STREAMING_XML = os.environ.get("BGG_STREAMING_XML", "1") != "0"
 
-# Simple in-memory TTL caches
-try:
-    from collections import OrderedDict
-except Exception:  # pragma: no cover
-    OrderedDict = dict  # type: ignore
 
+class TokenBucket:
+    """Thread-safe token bucket shared by every thread that talks to BGG.
+
+    ``acquire`` reserves a token under the lock and sleeps outside it, so
+    concurrent callers queue up at the configured rate instead of racing.
+    ``reserve`` does the same without sleeping, for callers (the async
+    client) that wait on their own.
+    """
 
-class TTLCache:
-    def __init__(self, capacity: int, default_ttl: float):
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
         self.capacity = capacity
-        self.default_ttl = default_ttl
-        self.data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
-
-    def _purge(self):
-        now = time.time()
-        # Drop expired entries
-        expired = [k for k, (exp, _) in self.data.items() if exp < now]
-        for k in expired:
-            self.data.pop(k, None)
-        # Enforce capacity (LRU)
-        while len(self.data) > self.capacity:
-            self.data.popitem(last=False)
-
-    def get(self, key: Any) -> Any:
-        self._purge()
-        item = self.data.get(key)
-        if not item:
-            return None
-        exp, val = item
-        if exp < time.time():
-            self.data.pop(key, None)
-            return None
-        # Mark as recently used
-        self.data.move_to_end(key, last=True)
-        return val
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
 
-    def set(self, key: Any, val: Any, ttl: Optional[float] = None):
-        exp = time.time() + (ttl if ttl is not None else self.default_ttl)
-        self.data[key] = (exp, val)
-        self.data.move_to_end(key, last=True)
-        self._purge()
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
 
 
+_BGG_RATE_LIMITER = TokenBucket(rate=1.0 / _MIN_HTTP_INTERVAL_SEC, capacity=1.0)
+
+# Simple in-memory TTL caches
 _SEARCH_CACHE = TTLCache(capacity=256, default_ttl=10 * 60)  # 10 minutes
 _THING_CACHE = TTLCache(capacity=4096, default_ttl=24 * 60 * 60)  # 24 hours
 _HOT_IDS_CACHE = TTLCache(capacity=16, default_ttl=5 * 60)  # 5 minutes
+
+# Serialized /hot and /search bodies keyed by path + query string. Entries
+# are only reused while the cache generation they were built at is current;
+# the TTL bounds how long a response can outlive silent expiry upstream.
+_RESPONSE_MAX_AGE = int(os.environ.get("BGG_RESPONSE_MAX_AGE", "60"))
+_RESPONSE_CACHE = TTLCache(
+    capacity=int(os.environ.get("BGG_RESPONSE_CACHE_SIZE", "512")), default_ttl=_RESPONSE_MAX_AGE
+)
 _HOT_MIN_EXPECTED = 40  # refresh hot list if we cached fewer than this
 
+
+class _Flight:
+    __slots__ = ("event", "result", "error", "_lock", "_callbacks")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    def wait(self) -> Any:
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def finish(self):
+        with self._lock:
+            self.event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_done_callback(self, callback: Callable[[], None]):
+        # Runs on the finishing thread, or right away if already finished
+        with self._lock:
+            if not self.event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    async def wait_async(self) -> Any:
+        # Awaits a flight owned by any thread or loop without blocking ours
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: done.done() or done.set_result(None))
+
+        self.add_done_callback(wake)
+        await done
+        return self.wait()
+
+
+class SingleFlight:
+    """Coalesces concurrent upstream fetches for the same key.
+
+    The first caller for a key runs the fetch; callers that arrive while it
+    is in flight wait for it and share the result (or exception). Keys are
+    tuples whose first element names the kind ("search", "hot", "thing"),
+    which is what the counters are grouped by.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Any, _Flight] = {}
+        self.issued: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    def _count(self, counter: Dict[str, int], key: Any):
+        kind = key[0] if isinstance(key, tuple) and key else str(key)
+        counter[kind] = counter.get(kind, 0) + 1
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> Any:
+        owned, waiting = self.claim([key])
+        if waiting:
+            return waiting[key].wait()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.fail(owned, e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    async def do_async(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Same flights as ``do``, so sync and async callers coalesce together
+        owned, waiting = self.claim([key])
+        if waiting:
+            return await waiting[key].wait_async()
+        try:
+            result = await fn()
+        except BaseException as e:
+            self.fail(owned, e)
+            raise
+        self.resolve(key, result)
+        return result
+
+    def claim(self, keys: Iterable[Any]) -> Tuple[List[Any], Dict[Any, _Flight]]:
+        # Returns (keys this caller must fetch and then resolve, flights
+        # already started by other callers that it should wait on).
+        owned: List[Any] = []
+        waiting: Dict[Any, _Flight] = {}
+        with self._lock:
+            for key in keys:
+                flight = self._flights.get(key)
+                if flight is not None:
+                    waiting[key] = flight
+                    self._count(self.coalesced, key)
+                    continue
+                self._flights[key] = _Flight()
+                owned.append(key)
+                self._count(self.issued, key)
+        return owned, waiting
+
+    def resolve(self, key: Any, result: Any):
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight.result = result
+            flight.finish()
+
+    def fail(self, keys: Iterable[Any], error: BaseException):
+        with self._lock:
+            flights = [self._flights.pop(key, None) for key in keys]
+        for flight in flights:
+            if flight is not None:
+                flight.error = error
+                flight.finish()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"issued": dict(self.issued), "coalesced": dict(self.coalesced)}
+
+
+_BGG_INFLIGHT = SingleFlight()
+
+# Background refreshes for entries served stale
+_SWR_WORKERS = 2
+_SWR_MEMORY_TTL = 60  # stale data only sits in memory briefly
+_SWR_POOL: Optional[ThreadPoolExecutor] = None
+_SWR_PENDING: Set[Any] = set()
+_SWR_LOCK = threading.Lock()
+
+
+def _swr_schedule(keys: Iterable[Any], refresh: Callable[[List[Any]], Any]):
+    # Queue one background refresh for the keys that aren't already queued.
+    global _SWR_POOL
+    with _SWR_LOCK:
+        todo = [key for key in keys if key not in _SWR_PENDING]
+        if not todo:
+            return
+        _SWR_PENDING.update(todo)
+        if _SWR_POOL is None:
+            _SWR_POOL = ThreadPoolExecutor(max_workers=_SWR_WORKERS, thread_name_prefix="bgg-swr")
+        pool = _SWR_POOL
+
+    def run():
+        try:
+            refresh(todo)
+        except Exception:
+            pass
+        finally:
+            with _SWR_LOCK:
+                _SWR_PENDING.difference_update(todo)
+
+    pool.submit(run)
+
 # -------------------- Persistent (SQLite) cache --------------------
 
 CACHE_DB_PATH = os.path.join(os.path.dirname(__file__), "cache.db")
 
-def _pc_conn():
-    conn = sqlite3.connect(CACHE_DB_PATH)
+_PC_LOCAL = threading.local()
+_PC_INIT_LOCK = threading.Lock()
+_PC_READY_PATHS: Set[str] = set()
+_PC_LAST_SWEEP_TS: float = 0.0
+_PC_SWEEP_INTERVAL_SEC: float = 10 * 60
+_PC_CACHED_STATEMENTS = 64
+
+# Bump when the shape produced by _normalize_game_payload changes; rows with
+# an older version are normalized on read until the migration rewrites them.
+_THING_SCHEMA_VERSION = 2
+
+# Version 2 row layout: scalars used for filtering/ranking live in real
+# columns, the description is a zlib blob, and ``data`` keeps only the
+# remaining fields as compact JSON. Versions 0/1 stored the whole payload
+# as JSON text in ``data``.
+_THING_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("name", "TEXT"),
+    ("year", "INTEGER"),
+    ("rating", "REAL"),
+    ("min_players", "INTEGER"),
+    ("max_players", "INTEGER"),
+    ("min_time", "INTEGER"),
+    ("max_time", "INTEGER"),
+    ("weight", "TEXT"),
+    ("rank", "INTEGER"),
+    ("users_rated", "INTEGER"),
+    ("bayes_average", "REAL"),
+    ("avg_weight", "REAL"),
+    ("description", "BLOB"),
+)
+_THING_ROW_FIELDS = ("id", "data", "has_stats", "expires_at", "schema_version") + tuple(c for c, _ in _THING_COLUMNS)
+_THING_REPLACE_SQL = (
+    f"REPLACE INTO bgg_cache_thing ({', '.join(_THING_ROW_FIELDS)}) "
+    f"VALUES ({', '.join('?' * len(_THING_ROW_FIELDS))})"
+)
+_THING_DESCRIPTION_LEVEL = 6
+
+# Full-text index over cached names, alternate names and tag slugs, kept in
+# step with bgg_cache_thing (rowid = game id). Disabled automatically if the
+# SQLite build lacks FTS5.
+_PC_FTS_ENABLED = True
+_LOCAL_SEARCH = os.environ.get("BGG_LOCAL_SEARCH", "1") != "0"
+# Local name matches needed to answer without BGG (handlers pass the
+# number of results the page needs); with fewer, BGG is asked and the local
+# matches are only served if that fails.
+_LOCAL_SEARCH_MIN_RESULTS = 20
+_LOCAL_SEARCH_LIMIT = 200
+
+# Page filling: ids hydrated per step, and how far past the skipped matches a
+# single request may scan before returning a short page with a cursor.
+_PAGE_HYDRATE_CHUNK = 20
+_PAGE_MAX_SCAN = int(os.environ.get("BGG_PAGE_MAX_SCAN", "200"))
+
+_PC_MIGRATE_ON_START = os.environ.get("BGG_CACHE_MIGRATE_ON_START", "1") != "0"
+
+# Stale-while-revalidate: how long past expires_at a row may still be served
+# (while a background refresh runs). 0 disables SWR for that table.
+_PC_STALE_WINDOWS: Dict[str, int] = {
+    "bgg_cache_search": int(os.environ.get("BGG_STALE_SEARCH_SEC", "0")),
+    "bgg_cache_thing": int(os.environ.get("BGG_STALE_THING_SEC", str(7 * 24 * 60 * 60))),
+    "bgg_cache_hot": int(os.environ.get("BGG_STALE_HOT_SEC", str(60 * 60))),
+}
+
+
+# Bumped on every cache write (thing, search, hot) and sweep. Serialized
+# responses remember the generation they were built at, so any write makes
+# them rebuild; unchanged bytes still keep their ETag.
+_CACHE_GENERATION = 0
+_CACHE_GENERATION_LOCK = threading.Lock()
+
+
+def _bump_generation():
+    global _CACHE_GENERATION
+    with _CACHE_GENERATION_LOCK:
+        _CACHE_GENERATION += 1
+
+
+def _pc_open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5.0, cached_statements=_PC_CACHED_STATEMENTS)
     conn.row_factory = sqlite3.Row
+    try:
+        # WAL lets request threads read while another thread writes; NORMAL is
+        # durable enough for a cache that can always be refetched from BGG.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+    except sqlite3.DatabaseError:
+        pass
     return conn
 
 
-def _pc_init():
-    conn = _pc_conn()
+def _pc_conn() -> sqlite3.Connection:
+    # One connection per thread, reused across calls so sqlite3's statement
+    # cache keeps our prepared SELECT/REPLACE statements warm.
+    path = CACHE_DB_PATH
+    conn = getattr(_PC_LOCAL, "conn", None)
+    if conn is not None and getattr(_PC_LOCAL, "path", None) == path:
+        return conn
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _pc_init()
+    conn = _pc_open(path)
+    _PC_LOCAL.conn = conn
+    _PC_LOCAL.path = path
+    return conn
+
+
+def _pc_reset():
+    # Drop this thread's connection and force schema setup to run again
+    # (used when CACHE_DB_PATH is swapped, e.g. by benchmarks).
+    conn = getattr(_PC_LOCAL, "conn", None)
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _PC_LOCAL.conn = None
+    _PC_LOCAL.path = None
+    with _PC_INIT_LOCK:
+        _PC_READY_PATHS.clear()
+    _bump_generation()
+    _TAG_INDEX.clear()
+    _SIMILAR_INDEX.clear()
+    if _FEATURE_MATRIX is not None:
+        _FEATURE_MATRIX.clear()
+
+
+def _pc_sweep_expired(conn: sqlite3.Connection):
+    global _PC_LAST_SWEEP_TS
+    now = int(time.time())
+    swept: List[int] = []
+    for table, window in _PC_STALE_WINDOWS.items():
+        if table == "bgg_cache_thing":
+            # SELECT then DELETE rather than RETURNING (SQLite < 3.35)
+            swept = [int(row[0]) for row in conn.execute(f"SELECT id FROM {table} WHERE expires_at < ?", (now - window,))]
+            if swept:
+                conn.execute(f"DELETE FROM {table} WHERE expires_at < ?", (now - window,))
+        else:
+            conn.execute(f"DELETE FROM {table} WHERE expires_at < ?", (now - window,))
+    if _PC_FTS_ENABLED:
+        try:
+            conn.execute("DELETE FROM bgg_thing_fts WHERE rowid NOT IN (SELECT id FROM bgg_cache_thing)")
+        except sqlite3.OperationalError:
+            pass
+    conn.execute("DELETE FROM bgg_game_tag WHERE game_id NOT IN (SELECT id FROM bgg_cache_thing)")
+    conn.commit()
+    if swept:
+        # Reads already skipped these rows, but the in-memory indexes still
+        # hold them. Search/hot rows don't need this: reads ignore them too.
+        _TAG_INDEX.remove(swept)
+        _SIMILAR_INDEX.remove(swept)
+        if _FEATURE_MATRIX is not None:
+            _FEATURE_MATRIX.remove(swept)
+        _bump_generation()
+    _PC_LAST_SWEEP_TS = time.time()
+
+
+def _pc_maybe_sweep(conn: sqlite3.Connection):
+    # Reads already ignore expired rows; the sweep only bounds table growth,
+    # so it runs on the write path at most once per interval.
+    if time.time() - _PC_LAST_SWEEP_TS < _PC_SWEEP_INTERVAL_SEC:
+        return
     try:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS bgg_cache_search (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                expires_at INTEGER NOT NULL
+        _pc_sweep_expired(conn)
+    except sqlite3.DatabaseError:
+        pass
+
+
+def _pc_init():
+    path = CACHE_DB_PATH
+    if path in _PC_READY_PATHS:
+        return
+    with _PC_INIT_LOCK:
+        if path in _PC_READY_PATHS:
+            return
+        conn = _pc_open(path)
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bgg_cache_search (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at INTEGER NOT NULL
+                )
+                """
             )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS bgg_cache_thing (
-                id INTEGER PRIMARY KEY,
-                data TEXT NOT NULL,
-                has_stats INTEGER NOT NULL,
-                expires_at INTEGER NOT NULL
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bgg_cache_thing (
+                    id INTEGER PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    has_stats INTEGER NOT NULL,
+                    expires_at INTEGER NOT NULL,
+                    schema_version INTEGER NOT NULL DEFAULT 0
+                )
+                """
             )
-            """
-        )
+            _pc_add_column(conn, "bgg_cache_thing", "schema_version", "INTEGER NOT NULL DEFAULT 0")
+            for column, decl in _THING_COLUMNS:
+                _pc_add_column(conn, "bgg_cache_thing", column, decl)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bgg_cache_hot (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at INTEGER NOT NULL
+                )
+                """
+            )
+            _pc_init_fts(conn)
+            _pc_init_filter_index(conn)
+            _pc_sweep_expired(conn)
+            outdated = conn.execute(
+                "SELECT 1 FROM bgg_cache_thing WHERE schema_version < ? LIMIT 1",
+                (_THING_SCHEMA_VERSION,),
+            ).fetchone()
+        finally:
+            conn.close()
+        _PC_READY_PATHS.add(path)
+    if outdated and _PC_MIGRATE_ON_START:
+        threading.Thread(target=_pc_migrate_things, args=(path,), name="bgg-cache-migrate", daemon=True).start()
+
+
+def _pc_init_fts(conn: sqlite3.Connection):
+    global _PC_FTS_ENABLED
+    try:
         conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS bgg_cache_hot (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                expires_at INTEGER NOT NULL
+            CREATE VIRTUAL TABLE IF NOT EXISTS bgg_thing_fts USING fts5(
+                name, alt_names, tags,
+                tokenize = "unicode61 remove_diacritics 2"
             )
             """
         )
-        now = int(time.time())
-        conn.execute("DELETE FROM bgg_cache_search WHERE expires_at < ?", (now,))
-        conn.execute("DELETE FROM bgg_cache_thing WHERE expires_at < ?", (now,))
-        conn.execute("DELETE FROM bgg_cache_hot WHERE expires_at < ?", (now,))
-        conn.commit()
-    finally:
-        conn.close()
+    except sqlite3.OperationalError:
+        _PC_FTS_ENABLED = False
+        return
+    if conn.execute("SELECT 1 FROM bgg_thing_fts LIMIT 1").fetchone() is None:
+        # New index on an existing cache: fill it from current-version rows
+        # (older rows are indexed as the migration rewrites them).
+        rows = conn.execute(
+            "SELECT id, name, data FROM bgg_cache_thing WHERE schema_version >= ?",
+            (_THING_SCHEMA_VERSION,),
+        ).fetchall()
+        entries = []
+        for row in rows:
+            try:
+                rest = json.loads(row["data"]) or {}
+            except Exception:
+                continue
+            entries.append((int(row["id"]), row["name"] or "", " ".join(rest.get("altNames") or []), " ".join(rest.get("tags") or [])))
+        with conn:
+            _pc_index_things(conn, entries)
+
+
+def _pc_init_filter_index(conn: sqlite3.Connection):
+    # Indexes for filter pushdown over the scalar columns, plus a tag join
+    # table (one row per game/tag slug).
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bgg_game_tag (
+            tag TEXT NOT NULL,
+            game_id INTEGER NOT NULL,
+            PRIMARY KEY (tag, game_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_game_tag_game ON bgg_game_tag (game_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_thing_players ON bgg_cache_thing (min_players, max_players)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_thing_time ON bgg_cache_thing (min_time, max_time)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_thing_weight ON bgg_cache_thing (weight)")
+    conn.commit()
+    if conn.execute("SELECT 1 FROM bgg_game_tag LIMIT 1").fetchone() is None:
+        rows = conn.execute(
+            "SELECT id, data FROM bgg_cache_thing WHERE schema_version >= ?",
+            (_THING_SCHEMA_VERSION,),
+        ).fetchall()
+        tags: Dict[int, List[str]] = {}
+        for row in rows:
+            try:
+                tags[int(row["id"])] = (json.loads(row["data"]) or {}).get("tags") or []
+            except Exception:
+                continue
+        with conn:
+            _pc_index_tags(conn, tags)
 
 
-def _pc_get_search(key: str) -> Optional[List[int]]:
-    _pc_init()
+def _pc_index_tags(conn: sqlite3.Connection, tags: Dict[int, List[str]]):
+    # Caller owns the transaction, as with _pc_index_things.
+    if not tags:
+        return
+    conn.executemany("DELETE FROM bgg_game_tag WHERE game_id = ?", [(gid,) for gid in tags])
+    conn.executemany(
+        "INSERT OR IGNORE INTO bgg_game_tag (tag, game_id) VALUES (?, ?)",
+        [(tag, gid) for gid, game_tags in tags.items() for tag in game_tags],
+    )
+    _TAG_INDEX.update(tags)
+    _SIMILAR_INDEX.update(tags)
+
+
+def _pc_filter_ids(ids: List[int], filters: Dict[str, Any]) -> Tuple[Set[int], Set[int]]:
+    """Evaluate request filters in SQL for the cached subset of ``ids``.
+
+    Returns (matching, known): ids whose cached row passes the filters, and
+    every id the cache could judge at all. Ids outside ``known`` have not
+    been fetched yet and are left to the Python filter after hydration.
+    """
+    conds: List[str] = []
+    params: List[Any] = []
+    if filters.get("players") is not None:
+        conds.append("min_players <= ? AND max_players >= ?")
+        params += [filters["players"], filters["players"]]
+    if filters.get("weight"):
+        conds.append("weight = ?")
+        params.append(filters["weight"])
+    if filters.get("min_time") is not None:
+        conds.append("max_time >= ?")
+        params.append(filters["min_time"])
+    if filters.get("max_time") is not None:
+        conds.append("min_time <= ?")
+        params.append(filters["max_time"])
+    tag_filters = sorted(filters.get("tags") or [])
+    if tag_filters:
+        matched = (
+            "(SELECT COUNT(*) FROM bgg_game_tag gt WHERE gt.game_id = bgg_cache_thing.id "
+            f"AND gt.tag IN ({','.join('?' * len(tag_filters))}))"
+        )
+        conds.append(f"{matched} = ?" if filters.get("tag_mode") == "all" else f"{matched} > 0")
+        params += tag_filters
+        if filters.get("tag_mode") == "all":
+            params.append(len(tag_filters))
+    match_expr = " AND ".join(f"({c})" for c in conds) or "1"
+
     conn = _pc_conn()
-    try:
-        cur = conn.execute("SELECT value, expires_at FROM bgg_cache_search WHERE key = ?", (key,))
-        row = cur.fetchone()
-        if not row:
+    oldest = int(time.time()) - _PC_STALE_WINDOWS["bgg_cache_thing"]
+    matching: Set[int] = set()
+    known: Set[int] = set()
+    for chunk in _chunked(_dedupe_preserve(ids), _PC_MAX_VARS):
+        cur = conn.execute(
+            f"SELECT id, ({match_expr}) AS ok FROM bgg_cache_thing "
+            f"WHERE id IN ({','.join('?' * len(chunk))}) AND expires_at >= ? AND schema_version >= ?",
+            (*params, *chunk, oldest, _THING_SCHEMA_VERSION),
+        )
+        for row in cur.fetchall():
+            gid = int(row["id"])
+            known.add(gid)
+            if row["ok"]:
+                matching.add(gid)
+    return matching, known
+
+
+def _pc_load_tags(conn: sqlite3.Connection) -> Dict[int, List[str]]:
+    # Every current-schema cached game with its tags (possibly none)
+    rows = conn.execute(
+        "SELECT t.id, g.tag FROM bgg_cache_thing t "
+        "LEFT JOIN bgg_game_tag g ON g.game_id = t.id WHERE t.schema_version >= ?",
+        (_THING_SCHEMA_VERSION,),
+    ).fetchall()
+    tags: Dict[int, List[str]] = {}
+    for row in rows:
+        bucket = tags.setdefault(int(row[0]), [])
+        if row[1] is not None:
+            bucket.append(row[1])
+    return tags
+
+
+class TagIndex:
+    """Inverted index from tag slug to a bitmap of game positions.
+
+    Bitmaps are plain ints (bit i = the game at position i), so AND/OR
+    queries and facet counts over the whole cached catalog are a handful of
+    big-int operations. Loaded lazily from bgg_game_tag and kept current by
+    _pc_index_tags; clear() drops it so the next query reloads. Positions
+    freed by remove() are reused, lowest first, so bitmaps stay as wide as
+    the largest catalog held at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._pos: Dict[int, int] = {}
+        self._ids: List[int] = []
+        self._free: List[int] = []  # heap of released positions
+        self._bits: Dict[str, int] = {}
+        self._tags: Dict[int, Tuple[str, ...]] = {}
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        conn = _pc_conn()
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            self._apply(_pc_load_tags(conn))
+
+    def _apply(self, tags: Dict[int, List[str]]):
+        for gid, game_tags in tags.items():
+            pos = self._pos.get(gid)
+            if pos is None:
+                if self._free:
+                    pos = heapq.heappop(self._free)
+                    self._ids[pos] = gid
+                else:
+                    pos = len(self._ids)
+                    self._ids.append(gid)
+                self._pos[gid] = pos
+            bit = 1 << pos
+            for tag in self._tags.get(gid, ()):
+                self._bits[tag] &= ~bit
+            for tag in game_tags:
+                self._bits[tag] = self._bits.get(tag, 0) | bit
+            self._tags[gid] = tuple(game_tags)
+
+    def update(self, tags: Dict[int, List[str]]):
+        # Before the first load there is nothing to patch; the load reads
+        # the rows these tags were written with.
+        with self._lock:
+            if self._loaded:
+                self._apply(tags)
+
+    def remove(self, ids: Iterable[int]):
+        # Swept games: their bits are cleared, they read as unknown, and
+        # their positions go back on the free list.
+        with self._lock:
+            for gid in ids:
+                pos = self._pos.pop(gid, None)
+                if pos is None:
+                    continue
+                heapq.heappush(self._free, pos)
+                bit = 1 << pos
+                for tag in self._tags.pop(gid, ()):
+                    self._bits[tag] &= ~bit
+                    if not self._bits[tag]:
+                        del self._bits[tag]
+
+    def clear(self):
+        with self._lock:
+            self._loaded = False
+            self._pos = {}
+            self._ids = []
+            self._free = []
+            self._bits = {}
+            self._tags = {}
+
+    def query(self, tags: Iterable[str], mode: str = "any") -> int:
+        self._ensure_loaded()
+        bitmaps = [self._bits.get(tag, 0) for tag in tags]
+        if not bitmaps:
+            return 0
+        out = bitmaps[0]
+        for bits in bitmaps[1:]:
+            out = out & bits if mode == "all" else out | bits
+        return out
+
+    def test(self, gid: Any, bitmap: int) -> Optional[bool]:
+        # None when the game isn't indexed (caller falls back to its tags)
+        try:
+            pos = self._pos.get(int(gid))
+        except (TypeError, ValueError):
             return None
-        if int(row["expires_at"]) < int(time.time()):
-            conn.execute("DELETE FROM bgg_cache_search WHERE key = ?", (key,))
-            conn.commit()
+        if pos is None:
             return None
-        try:
-            return json.loads(row["value"]) or []
-        except Exception:
+        return bool(bitmap >> pos & 1)
+
+    def ids(self, bitmap: int) -> List[int]:
+        out: List[int] = []
+        while bitmap:
+            low = bitmap & -bitmap
+            out.append(self._ids[low.bit_length() - 1])
+            bitmap ^= low
+        return out
+
+    def select(self, ids: Iterable[int], tags: Iterable[str], mode: str = "any") -> Tuple[Set[int], Set[int]]:
+        # (matching, known) like _pc_filter_ids, for the tag part alone
+        bitmap = self.query(tags, mode)
+        matching: Set[int] = set()
+        known: Set[int] = set()
+        for gid in ids:
+            hit = self.test(gid, bitmap)
+            if hit is None:
+                continue
+            known.add(gid)
+            if hit:
+                matching.add(gid)
+        return matching, known
+
+    def facets(self, ids: Iterable[int], limit: int = 30) -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        base = 0
+        for gid in ids:
+            pos = self._pos.get(gid)
+            if pos is not None:
+                base |= 1 << pos
+        if not base:
+            return []
+        with self._lock:
+            counts = [(tag, (bits & base).bit_count()) for tag, bits in self._bits.items()]
+        counts = [c for c in counts if c[1]]
+        counts.sort(key=lambda c: (-c[1], c[0]))
+        return [{"tag": tag, "count": count} for tag, count in counts[:limit]]
+
+    def stats(self) -> Dict[str, int]:
+        return {"games": len(self._pos), "tags": len(self._bits)}
+
+
+_TAG_INDEX = TagIndex()
+
+# MinHash LSH over tag sets: _SIMILAR_BANDS bands of _SIMILAR_ROWS hashes.
+# Two rows per band keeps recall up for the low Jaccard values typical of
+# BGG tag sets; candidates are then capped by estimated similarity.
+_SIMILAR_BANDS = 16
+_SIMILAR_ROWS = 2
+_SIMILAR_MAX_CANDIDATES = 500
+_MINHASH_PRIME = (1 << 61) - 1
+
+
+class SimilarityIndex:
+    """MinHash signatures of each cached game's tags, bucketed by LSH band.
+
+    Loaded lazily from bgg_game_tag and patched alongside TagIndex.
+    ``candidates`` returns games sharing at least one band bucket, ranked by
+    the fraction of agreeing signature slots (an estimate of tag Jaccard).
+    """
+
+    def __init__(self, bands: int = _SIMILAR_BANDS, rows: int = _SIMILAR_ROWS, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MINHASH_PRIME), rng.randrange(0, _MINHASH_PRIME)) for _ in range(bands * rows)
+        ]
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._tag_hashes: Dict[str, List[int]] = {}
+        self._sigs: Dict[int, Tuple[int, ...]] = {}
+        # One dict per band: hash of the band's slots -> game ids
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(bands)]
+
+    def _tag_vector(self, tag: str) -> List[int]:
+        # The tag's value under every permutation, computed once per tag
+        vec = self._tag_hashes.get(tag)
+        if vec is None:
+            x = int.from_bytes(hashlib.blake2b(tag.encode("utf-8"), digest_size=8).digest(), "big")
+            vec = [(a * x + b) % _MINHASH_PRIME for a, b in self._perms]
+            self._tag_hashes[tag] = vec
+        return vec
+
+    def signature(self, tags: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        vectors = [self._tag_vector(tag) for tag in set(tags)]
+        if not vectors:
             return None
-    finally:
-        conn.close()
+        if len(vectors) == 1:
+            return tuple(vectors[0])
+        return tuple(map(min, *vectors))
+
+    def _band_keys(self, sig: Tuple[int, ...]) -> List[int]:
+        return list(map(hash, zip(*(sig[i::self.rows] for i in range(self.rows)))))
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        conn = _pc_conn()
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            self._apply(_pc_load_tags(conn))
+
+    def _discard(self, gid: int):
+        old = self._sigs.pop(gid, None)
+        if old is None:
+            return
+        for buckets, key in zip(self._buckets, self._band_keys(old)):
+            bucket = buckets.get(key)
+            if bucket is not None:
+                bucket.discard(gid)
+                if not bucket:
+                    del buckets[key]
+
+    def _apply(self, tags: Dict[int, List[str]]):
+        for gid, game_tags in tags.items():
+            self._discard(gid)
+            sig = self.signature(game_tags)
+            if sig is None:
+                continue
+            self._sigs[gid] = sig
+            for buckets, key in zip(self._buckets, self._band_keys(sig)):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = {gid}
+                else:
+                    bucket.add(gid)
+
+    def update(self, tags: Dict[int, List[str]]):
+        with self._lock:
+            if self._loaded:
+                self._apply(tags)
+
+    def remove(self, ids: Iterable[int]):
+        with self._lock:
+            for gid in ids:
+                self._discard(gid)
+
+    def clear(self):
+        with self._lock:
+            self._loaded = False
+            self._sigs = {}
+            self._buckets = [{} for _ in range(self.bands)]
+
+    def candidates(self, gid: int, tags: Iterable[str], limit: int = _SIMILAR_MAX_CANDIDATES) -> List[Tuple[int, float]]:
+        self._ensure_loaded()
+        sig = self._sigs.get(gid) or self.signature(tags)
+        if sig is None:
+            return []
+        with self._lock:
+            found: Set[int] = set()
+            for buckets, key in zip(self._buckets, self._band_keys(sig)):
+                found |= buckets.get(key, set())
+            found.discard(gid)
+            sigs = {other: self._sigs[other] for other in found if other in self._sigs}
+        slots = len(sig)
+        scored = [
+            (other, sum(1 for a, b in zip(sig, other_sig) if a == b) / slots) for other, other_sig in sigs.items()
+        ]
+        if len(scored) > limit:
+            return heapq.nlargest(limit, scored, key=lambda c: c[1])
+        scored.sort(key=lambda c: -c[1])
+        return scored
+
+    def stats(self) -> Dict[str, int]:
+        return {"games": len(self._sigs), "buckets": sum(len(buckets) for buckets in self._buckets)}
+
+
+_SIMILAR_INDEX = SimilarityIndex()
+
+
+class FeatureMatrix:
+    """NumPy corpus of every cached game for vectorized scoring.
+
+    ``dense`` holds one float64 row per game (see FEATURES; missing player
+    counts and times are 0 as in _apply_filters, other gaps NaN) and
+    ``tags`` a bit-packed uint8 row over the tag vocabulary.
+    Rows are assigned on first sight (reusing rows freed by remove()) and
+    overwritten in place on update; both arrays grow by doubling. Loaded
+    lazily from bgg_cache_thing.
+    """
+
+    FEATURES = ("min_players", "max_players", "min_time", "max_time", "weight", "rating", "bayes_average")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def _reset(self):
+        self._pos: Dict[int, int] = {}
+        self._free: List[int] = []  # heap of released rows
+        self._vocab: Dict[str, int] = {}
+        self._n = 0  # rows in use or free; everything past is unallocated
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.live = np.zeros(0, dtype=bool)
+        self.dense = np.zeros((0, len(self.FEATURES)), dtype=np.float64)
+        self.tags = np.zeros((0, 0), dtype=np.uint8)
+        self.tag_counts = np.zeros(0, dtype=np.int32)
+
+    @staticmethod
+    def _row(game: Dict[str, Any]) -> List[float]:
+        players = game.get("players") or {}
+        play_time = game.get("time") or {}
+        weight = _WEIGHT_ORDER.get(game.get("weight"))
+        values = [
+            players.get("min"),
+            players.get("max"),
+            play_time.get("min"),
+            play_time.get("max"),
+            weight,
+            game.get("rating"),
+            (game.get("stats") or {}).get("bayesAverage"),
+        ]
+        return [(0.0 if i < 4 else math.nan) if v is None else float(v) for i, v in enumerate(values)]
+
+    def _grow(self, rows: int, tag_bytes: int):
+        cap, width = self.tags.shape
+        if rows > len(self.ids):
+            new_cap = max(rows, 2 * len(self.ids), 64)
+            self.ids = np.resize(self.ids, new_cap)
+            self.live = np.concatenate([self.live, np.zeros(new_cap - len(self.live), bool)])
+            self.dense = np.vstack([self.dense, np.full((new_cap - len(self.dense), len(self.FEATURES)), math.nan)])
+            self.tag_counts = np.concatenate([self.tag_counts, np.zeros(new_cap - len(self.tag_counts), np.int32)])
+            self.tags = np.vstack([self.tags, np.zeros((new_cap - cap, width), np.uint8)])
+            cap = new_cap
+        if tag_bytes > width:
+            new_width = max(tag_bytes, 2 * width)
+            self.tags = np.hstack([self.tags, np.zeros((cap, new_width - width), np.uint8)])
+
+    def _apply(self, games: Iterable[Dict[str, Any]]):
+        games = [g for g in games if g and g.get("id") is not None]
+        for game in games:
+            for tag in game.get("tags") or []:
+                if tag not in self._vocab:
+                    self._vocab[tag] = len(self._vocab)
+            gid = int(game["id"])
+            if gid not in self._pos:
+                if self._free:
+                    self._pos[gid] = heapq.heappop(self._free)
+                else:
+                    self._pos[gid] = self._n
+                    self._n += 1
+        self._grow(self._n, (len(self._vocab) + 7) // 8)
+        if not games:
+            return
+        rows = np.fromiter((self._pos[int(g["id"])] for g in games), dtype=np.int64, count=len(games))
+        self.ids[rows] = [int(g["id"]) for g in games]
+        self.live[rows] = True
+        self.dense[rows] = [self._row(g) for g in games]
+        self.tags[rows] = 0
+        bit_rows: List[int] = []
+        bit_cols: List[int] = []
+        for row, game in zip(rows.tolist(), games):
+            cols = {self._vocab[tag] for tag in game.get("tags") or []}
+            bit_rows.extend([row] * len(cols))
+            bit_cols.extend(cols)
+        cols_arr = np.asarray(bit_cols, dtype=np.int64)
+        np.bitwise_or.at(
+            self.tags,
+            (np.asarray(bit_rows, dtype=np.int64), cols_arr >> 3),
+            (128 >> (cols_arr & 7)).astype(np.uint8),
+        )
+        self.tag_counts[rows] = _POPCOUNT8[self.tags[rows]].sum(axis=1)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        conn = _pc_conn()
+        with self._lock:
+            if self._loaded:
+                return
+            tags = _pc_load_tags(conn)
+            rows = conn.execute(
+                "SELECT id, min_players, max_players, min_time, max_time, weight, rating, bayes_average "
+                "FROM bgg_cache_thing WHERE schema_version >= ?",
+                (_THING_SCHEMA_VERSION,),
+            ).fetchall()
+            self._loaded = True
+            self._apply(
+                {
+                    "id": row["id"],
+                    "players": {"min": row["min_players"], "max": row["max_players"]},
+                    "time": {"min": row["min_time"], "max": row["max_time"]},
+                    "weight": row["weight"],
+                    "rating": row["rating"],
+                    "stats": {"bayesAverage": row["bayes_average"]},
+                    "tags": tags.get(int(row["id"]), []),
+                }
+                for row in rows
+            )
 
+    def update(self, games: Iterable[Dict[str, Any]]):
+        with self._lock:
+            if self._loaded:
+                self._apply(games)
+
+    def remove(self, ids: Iterable[int]):
+        # Rows of swept games stop scoring and go back on the free list
+        with self._lock:
+            for gid in ids:
+                pos = self._pos.pop(gid, None)
+                if pos is not None:
+                    self.live[pos] = False
+                    heapq.heappush(self._free, pos)
+
+    def clear(self):
+        with self._lock:
+            self._loaded = False
+            self._reset()
+
+    def encode(self, game: Dict[str, Any]) -> Tuple[Any, Any]:
+        # Dense row and packed tag row for a game that may not be indexed
+        dense = np.asarray(self._row(game), dtype=np.float64)
+        packed = np.zeros(self.tags.shape[1], dtype=np.uint8)
+        for tag in set(game.get("tags") or []):
+            col = self._vocab.get(tag)
+            if col is not None:
+                packed[col >> 3] |= 128 >> (col & 7)
+        return dense, packed
+
+    def similarity_scores(self, game: Dict[str, Any]) -> Any:
+        """Score every indexed game against ``game`` with the /similar
+        formula (see _similarity); returns one float per row."""
+        self._ensure_loaded()
+        with self._lock:
+            n = self._n
+            dense, tags, tag_counts = self.dense[:n], self.tags[:n], self.tag_counts[:n]
+            base, base_tags = self.encode(game)
+            base_count = len(set(game.get("tags") or []))
+
+            # Only the bytes where the base game has tags can intersect
+            cols = np.flatnonzero(base_tags)
+            inter = _POPCOUNT8[tags[:, cols] & base_tags[cols]].sum(axis=1, dtype=np.int32)
+            union = tag_counts + base_count - inter
+            tag_score = np.divide(inter, union, out=np.zeros(n), where=union > 0)
+
+            players_score = _overlap_ratio(base[0], base[1] + 0.0001, dense[:, 0], dense[:, 1] + 0.0001)
+            time_score = _overlap_ratio(base[2], base[3], dense[:, 2], dense[:, 3])
+            weight_diff = np.abs(dense[:, 4] - base[4])
+            weight_score = np.where(np.isnan(weight_diff), 0.5, 1 - np.minimum(1, weight_diff / 2))
+            rating = dense[:, 5]
+            if np.isnan(base[5]) or not base[5]:
+                rating_score = np.full(n, 0.5)
+            else:
+                rating_diff = np.abs(rating - base[5])
+                rating_score = np.where(np.isnan(rating) | (rating == 0), 0.5, 1 - np.minimum(1, rating_diff / 5))
+
+            scores = 0.5 * tag_score + 0.2 * players_score + 0.15 * time_score + 0.1 * weight_score + 0.05 * rating_score
+            return np.where(self.live[:n], scores, -np.inf)
+
+    def top_k(self, scores: Any, k: int, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        # argpartition for the k best, then sort only those
+        exclude = list(exclude)
+        if exclude:
+            scores = np.array(scores, dtype=np.float64)
+        for gid in exclude:
+            pos = self._pos.get(gid)
+            if pos is not None and pos < len(scores):
+                scores[pos] = -np.inf
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(self.ids[i]), float(scores[i])) for i in best]
+
+    def stats(self) -> Dict[str, int]:
+        return {"games": int(self.live[:self._n].sum()), "tags": len(self._vocab)}
+
+
+def _overlap_ratio(a_min: float, a_max: float, b_min: Any, b_max: Any) -> Any:
+    # Vectorized _interval_overlap_ratio (scalar a against arrays b)
+    overlap = np.maximum(0.0, np.minimum(a_max, b_max) - np.maximum(a_min, b_min))
+    union = np.maximum(a_max, b_max) - np.minimum(a_min, b_min)
+    return np.divide(overlap, union, out=np.zeros(len(union)), where=union != 0)
+
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8) if np is not None else None
+_FEATURE_MATRIX = FeatureMatrix() if np is not None else None
+
+
+def _pc_fts_entry(game: Dict[str, Any], alt_names: Optional[List[str]]) -> Tuple[int, str, str, str]:
+    return (int(game["id"]), game.get("name") or "", " ".join(alt_names or []), " ".join(game.get("tags") or []))
+
+
+def _pc_index_things(conn: sqlite3.Connection, entries: List[Tuple[int, str, str, str]]):
+    # Caller owns the transaction so the index commits with the thing rows.
+    if not _PC_FTS_ENABLED or not entries:
+        return
+    conn.executemany("DELETE FROM bgg_thing_fts WHERE rowid = ?", [(e[0],) for e in entries])
+    conn.executemany("INSERT INTO bgg_thing_fts (rowid, name, alt_names, tags) VALUES (?, ?, ?, ?)", entries)
 
-def _pc_set_search(key: str, ids: List[int], ttl: int = 600):
-    _pc_init()
+
+def _pc_search_local(query: str, limit: int = _LOCAL_SEARCH_LIMIT) -> List[int]:
+    # Prefix match on every query token against names and alternate names;
+    # primary-name hits rank first. Tags stay out of the match so "war"
+    # doesn't pull in every game tagged "wargame".
+    if not _PC_FTS_ENABLED:
+        return []
+    tokens = re.findall(r"\w+", query.lower())
+    if not tokens:
+        return []
+    match = "{name alt_names} : (" + " ".join(f'"{tok}"*' for tok in tokens) + ")"
     conn = _pc_conn()
+    oldest = int(time.time()) - _PC_STALE_WINDOWS["bgg_cache_thing"]
     try:
-        expires = int(time.time()) + ttl
-        conn.execute(
-            "REPLACE INTO bgg_cache_search (key, value, expires_at) VALUES (?, ?, ?)",
-            (key, json.dumps(ids), expires),
-        )
+        rows = conn.execute(
+            """
+            SELECT bgg_thing_fts.rowid AS id FROM bgg_thing_fts
+            JOIN bgg_cache_thing t ON t.id = bgg_thing_fts.rowid
+            WHERE bgg_thing_fts MATCH ? AND t.expires_at >= ?
+            ORDER BY bm25(bgg_thing_fts, 10.0, 5.0, 1.0)
+            LIMIT ?
+            """,
+            (match, oldest, limit),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [int(row["id"]) for row in rows]
+
+
+def _pc_add_column(conn: sqlite3.Connection, table: str, column: str, decl: str):
+    cols = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in cols:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
         conn.commit()
+
+
+def _pc_migrate_things(path: Optional[str] = None, batch_size: int = 500) -> int:
+    """Rewrite bgg_cache_thing rows stored by an older schema version.
+
+    Runs once in the background after startup (and offline via
+    ``python -m backend.src.bgg migrate``) so reads never have to normalize
+    or write. Returns the number of rows rewritten or dropped.
+    """
+    conn = _pc_open(path or CACHE_DB_PATH)
+    done = 0
+    last_id = None
+    try:
+        while True:
+            # Walk by primary key so a row that can't be rewritten is never
+            # selected twice
+            rows = conn.execute(
+                "SELECT id, data, expires_at FROM bgg_cache_thing "
+                "WHERE schema_version < ? AND (? IS NULL OR id > ?) ORDER BY id LIMIT ?",
+                (_THING_SCHEMA_VERSION, last_id, last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+            to_replace: List[Tuple[Any, ...]] = []
+            to_delete: List[Tuple[Any]] = []
+            entries: List[Tuple[int, str, str, str]] = []
+            tags: Dict[int, List[str]] = {}
+            migrated: List[Dict[str, Any]] = []
+            for row in rows:
+                gid = row["id"]
+                # Rows below the current version hold the full payload as JSON.
+                # Anything unreadable, or describing a game other than the
+                # row's key, is dropped and refetched on demand.
+                try:
+                    raw = json.loads(row["data"]) or None
+                    data = _normalize_game_payload(raw) if isinstance(raw, dict) else None
+                    if data and _coerce_int(str(data.get("id"))) != gid:
+                        data = None
+                    encoded = _pc_encode_thing(data, int(row["expires_at"])) if data else None
+                except Exception:
+                    encoded = None
+                if encoded is None:
+                    to_delete.append((gid,))
+                    continue
+                to_replace.append(encoded)
+                entries.append(_pc_fts_entry(data, None))
+                tags[gid] = data.get("tags") or []
+                migrated.append(data)
+            with conn:
+                if to_delete:
+                    conn.executemany("DELETE FROM bgg_cache_thing WHERE id = ?", to_delete)
+                if to_replace:
+                    conn.executemany(_THING_REPLACE_SQL, to_replace)
+                _pc_index_things(conn, entries)
+                _pc_index_tags(conn, tags)
+            if _FEATURE_MATRIX is not None:
+                _FEATURE_MATRIX.update(migrated)
+            _bump_generation()
+            done += len(rows)
     finally:
         conn.close()
+    return done
 
 
-def _pc_get_thing(gid: int, need_stats: bool = False) -> Optional[Dict[str, Any]]:
-    _pc_init()
+def _pc_get_search(key: str) -> Optional[List[int]]:
+    ids, is_stale = _pc_get_search_entry(key)
+    return None if is_stale else ids
+
+
+def _pc_get_search_entry(key: str) -> Tuple[Optional[List[int]], bool]:
     conn = _pc_conn()
+    cur = conn.execute("SELECT value, expires_at FROM bgg_cache_search WHERE key = ?", (key,))
+    row = cur.fetchone()
+    if not row:
+        return None, False
+    now = int(time.time())
+    expires_at = int(row["expires_at"])
+    if expires_at + _PC_STALE_WINDOWS["bgg_cache_search"] < now:
+        conn.execute("DELETE FROM bgg_cache_search WHERE key = ?", (key,))
+        conn.commit()
+        return None, False
     try:
-        cur = conn.execute(
-            "SELECT data, has_stats, expires_at FROM bgg_cache_thing WHERE id = ?",
-            (gid,),
-        )
-        row = cur.fetchone()
-        if not row:
-            return None
-        if int(row["expires_at"]) < int(time.time()):
-            conn.execute("DELETE FROM bgg_cache_thing WHERE id = ?", (gid,))
-            conn.commit()
-            return None
-        try:
-            raw = json.loads(row["data"]) or None
-        except Exception:
-            raw = None
-        if not raw:
-            return None
+        return (json.loads(row["value"]) or []), expires_at < now
+    except Exception:
+        return None, False
 
-        data = _normalize_game_payload(raw)
-        if not data:
-            conn.execute("DELETE FROM bgg_cache_thing WHERE id = ?", (gid,))
-            conn.commit()
-            return None
 
-        if data != raw:
-            try:
-                stats_block = data.get("stats") or {}
-                has_stats_val = 1 if (data.get("rating") is not None or any(stats_block.get(key) is not None for key in ("usersRated", "bayesAverage", "rank"))) else 0
-                conn.execute(
-                    "REPLACE INTO bgg_cache_thing (id, data, has_stats, expires_at) VALUES (?, ?, ?, ?)",
-                    (gid, json.dumps(data), has_stats_val, int(row["expires_at"])),
-                )
-                conn.commit()
-            except Exception:
-                pass
+def _pc_set_search(key: str, ids: List[int], ttl: int = 600):
+    conn = _pc_conn()
+    expires = int(time.time()) + ttl
+    conn.execute(
+        "REPLACE INTO bgg_cache_search (key, value, expires_at) VALUES (?, ?, ?)",
+        (key, json.dumps(ids), expires),
+    )
+    conn.commit()
+    _bump_generation()
+    _pc_maybe_sweep(conn)
+
+
+_PC_MAX_VARS = 500  # stay well under SQLite's bound-parameter limit
+
+
+def _pc_has_stats(data: Dict[str, Any]) -> int:
+    stats_block = data.get("stats") or {}
+    return 1 if (data.get("rating") is not None or any(stats_block.get(key) is not None for key in ("usersRated", "bayesAverage", "rank"))) else 0
+
+
+def _pc_encode_thing(game: Dict[str, Any], expires: int, alt_names: Optional[List[str]] = None) -> Tuple[Any, ...]:
+    # ``game`` must already be normalized; returns values for _THING_ROW_FIELDS.
+    # Alternate names are kept for the search index only, not the payload.
+    gid = int(game["id"])
+    players = game.get("players") or {}
+    play_time = game.get("time") or {}
+    stats = game.get("stats") or {}
+    rest = {"image": game.get("image") or "", "tags": game.get("tags") or [], "url": game.get("url") or ""}
+    if alt_names:
+        rest["altNames"] = alt_names
+    description = game.get("description") or ""
+    blob = zlib.compress(description.encode("utf-8"), _THING_DESCRIPTION_LEVEL) if description else None
+    return (
+        gid,
+        json.dumps(rest, separators=(",", ":")),
+        _pc_has_stats(game),
+        expires,
+        _THING_SCHEMA_VERSION,
+        game.get("name"),
+        game.get("year"),
+        game.get("rating"),
+        players.get("min"),
+        players.get("max"),
+        play_time.get("min"),
+        play_time.get("max"),
+        game.get("weight"),
+        stats.get("rank"),
+        stats.get("usersRated"),
+        stats.get("bayesAverage"),
+        stats.get("averageWeight"),
+        blob,
+    )
 
-        has_stats_flag = int(row["has_stats"] or 0)
-        if need_stats and not has_stats_flag:
-            stats_block = data.get("stats") or {}
-            if not any(stats_block.get(key) is not None for key in ("usersRated", "bayesAverage", "rank")) and data.get("rating") is None:
-                return None
 
-        return data
-    finally:
-        conn.close()
+def _pc_decode_thing(row: sqlite3.Row) -> Optional[Dict[str, Any]]:
+    version = int(row["schema_version"] or 0)
+    try:
+        data = json.loads(row["data"]) or None
+    except Exception:
+        return None
+    if not data:
+        return None
+    if version < _THING_SCHEMA_VERSION:
+        # Not migrated yet: normalize for this read only, never write here.
+        return _normalize_game_payload(data)
 
+    gid = str(row["id"])
+    name = row["name"] or ""
+    stats: Dict[str, Any] = {
+        "usersRated": row["users_rated"],
+        "bayesAverage": row["bayes_average"],
+        "rank": row["rank"],
+    }
+    if row["avg_weight"] is not None:
+        stats["averageWeight"] = row["avg_weight"]
+    blob = row["description"]
+    return {
+        "id": gid,
+        "name": name,
+        "image": data.get("image") or "",
+        "year": row["year"],
+        "rating": row["rating"],
+        "players": {"min": row["min_players"], "max": row["max_players"]},
+        "time": {"min": row["min_time"], "max": row["max_time"]},
+        "weight": row["weight"],
+        "tags": data.get("tags") or [],
+        "description": zlib.decompress(blob).decode("utf-8") if blob else "",
+        "stats": stats,
+        "url": data.get("url") or "",
+    }
 
-def _pc_set_thing(gid: int, data: Dict[str, Any], ttl: int = 24 * 60 * 60):
-    normalized = _normalize_game_payload(data)
-    if not normalized:
-        return
 
-    _pc_init()
+def _pc_get_things(
+    gids: Iterable[int],
+    need_stats: bool = False,
+    stale: Optional[Set[int]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    # Expired rows inside the stale window are only returned when the caller
+    # passes a ``stale`` set, which collects their ids. Pure read: expired
+    # rows are left for the sweep and old-shaped rows for the migration.
+    ids = _dedupe_preserve(int(g) for g in gids)
+    if not ids:
+        return {}
+
     conn = _pc_conn()
-    try:
-        expires = int(time.time()) + ttl
-        stats_block = normalized.get("stats") or {}
-        has_stats = 1 if (normalized.get("rating") is not None or any(stats_block.get(key) is not None for key in ("usersRated", "bayesAverage", "rank"))) else 0
-        conn.execute(
-            "REPLACE INTO bgg_cache_thing (id, data, has_stats, expires_at) VALUES (?, ?, ?, ?)",
-            (gid, json.dumps(normalized), has_stats, expires),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    now = int(time.time())
+    oldest = now - _PC_STALE_WINDOWS["bgg_cache_thing"]
+    found: Dict[int, Dict[str, Any]] = {}
 
+    for chunk in _chunked(ids, _PC_MAX_VARS):
+        placeholders = ",".join("?" * len(chunk))
+        cur = conn.execute(
+            f"SELECT {', '.join(_THING_ROW_FIELDS)} FROM bgg_cache_thing WHERE id IN ({placeholders}) AND expires_at >= ?",
+            (*chunk, oldest),
+        )
+        for row in cur.fetchall():
+            gid = int(row["id"])
+            if need_stats and not int(row["has_stats"] or 0):
+                continue
+            data = _pc_decode_thing(row)
+            if data is None:
+                continue
+            if int(row["expires_at"]) < now:
+                if stale is None:
+                    continue
+                stale.add(gid)
+            found[gid] = data
+
+    return found
+
+
+def _pc_set_things(
+    games: Iterable[Dict[str, Any]],
+    ttl: int = 24 * 60 * 60,
+    normalized: bool = False,
+    alt_names: Optional[Dict[int, List[str]]] = None,
+):
+    # Pass normalized=True when the payloads already came out of
+    # _normalize_game_payload to skip doing it twice. ``alt_names`` maps
+    # game id to alternate names for the search index.
+    expires = int(time.time()) + ttl
+    rows: List[Tuple[Any, ...]] = []
+    entries: List[Tuple[int, str, str, str]] = []
+    tags: Dict[int, List[str]] = {}
+    written: List[Dict[str, Any]] = []
+    for game in games:
+        game = game if normalized else _normalize_game_payload(game)
+        if not game:
+            continue
+        try:
+            names = (alt_names or {}).get(int(game["id"]))
+            rows.append(_pc_encode_thing(game, expires, names))
+        except (TypeError, ValueError):
+            continue
+        entries.append(_pc_fts_entry(game, names))
+        tags[int(game["id"])] = game.get("tags") or []
+        written.append(game)
+    if not rows:
+        return
 
-def _pc_get_hot(key: str) -> Optional[List[int]]:
-    _pc_init()
     conn = _pc_conn()
+    with conn:
+        conn.executemany(_THING_REPLACE_SQL, rows)
+        _pc_index_things(conn, entries)
+        _pc_index_tags(conn, tags)
+    if _FEATURE_MATRIX is not None:
+        _FEATURE_MATRIX.update(written)
+    _bump_generation()
+    _pc_maybe_sweep(conn)
+
+
+def _pc_get_hot_entry(key: str) -> Tuple[Optional[List[int]], bool]:
+    # Returns (ids, is_stale); stale entries are past expires_at but still
+    # inside the hot table's stale window.
+    conn = _pc_conn()
+    cur = conn.execute("SELECT value, expires_at FROM bgg_cache_hot WHERE key = ?", (key,))
+    row = cur.fetchone()
+    if not row:
+        return None, False
+    now = int(time.time())
+    expires_at = int(row["expires_at"])
+    if expires_at + _PC_STALE_WINDOWS["bgg_cache_hot"] < now:
+        conn.execute("DELETE FROM bgg_cache_hot WHERE key = ?", (key,))
+        conn.commit()
+        return None, False
     try:
-        cur = conn.execute("SELECT value, expires_at FROM bgg_cache_hot WHERE key = ?", (key,))
-        row = cur.fetchone()
-        if not row:
-            return None
-        if int(row["expires_at"]) < int(time.time()):
-            conn.execute("DELETE FROM bgg_cache_hot WHERE key = ?", (key,))
-            conn.commit()
-            return None
-        try:
-            return json.loads(row["value"]) or []
-        except Exception:
-            return None
-    finally:
-        conn.close()
+        return (json.loads(row["value"]) or []), expires_at < now
+    except Exception:
+        return None, False
 
 
 def _pc_set_hot(key: str, ids: List[int], ttl: int = 5 * 60):
-    _pc_init()
     conn = _pc_conn()
-    try:
-        expires = int(time.time()) + ttl
-        conn.execute(
-            "REPLACE INTO bgg_cache_hot (key, value, expires_at) VALUES (?, ?, ?)",
-            (key, json.dumps(ids), expires),
+    expires = int(time.time()) + ttl
+    conn.execute(
+        "REPLACE INTO bgg_cache_hot (key, value, expires_at) VALUES (?, ?, ?)",
+        (key, json.dumps(ids), expires),
+    )
+    conn.commit()
+    _bump_generation()
+    _pc_maybe_sweep(conn)
+
+
+_BGG_HTTP_POOL_SIZE = int(os.environ.get("BGG_HTTP_POOL_SIZE", "4"))
+_BGG_HTTP_CONNECT_TIMEOUT = float(os.environ.get("BGG_HTTP_CONNECT_TIMEOUT", "10"))
+_BGG_HTTP_READ_TIMEOUT = float(os.environ.get("BGG_HTTP_READ_TIMEOUT", "20"))
+_BGG_HTTP_MAX_REDIRECTS = 3
+
+_BGG_HEADERS = {
+    # Use a browser-like UA to avoid any overly strict filters/CDN heuristics
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0 Safari/537.36 BoardGameLibrary/1.0"
+    ),
+    "Accept": "application/xml, text/xml;q=0.9, */*;q=0.8",
+    "Accept-Encoding": "gzip",
+    "Connection": "keep-alive",
+}
+
+
+# Requests in flight per client, i.e. per event loop (the rate limiter is
+# shared by all of them).
+_BGG_ASYNC_CONCURRENCY = int(os.environ.get("BGG_ASYNC_CONCURRENCY", "8"))
+
+
+class AsyncHTTPClient:
+    """Minimal asyncio HTTP/1.1 GET client with keep-alive, for BGG only.
+
+    Bound to the event loop it is first used on. At most ``concurrency``
+    requests run at once; up to ``pool_size`` idle connections are kept per
+    (scheme, host, port). Failures surface as ``urllib.error.URLError`` /
+    ``HTTPError`` so the retry loops can treat them like urllib errors.
+    """
+
+    def __init__(self, concurrency: int = 8, pool_size: int = 4, connect_timeout: float = 10.0, read_timeout: float = 20.0):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._sem = asyncio.Semaphore(concurrency)
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self.requests = 0
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "opened": self.opened,
+            "reused": self.reused,
+            "discarded": self.discarded,
+            "idle": sum(len(conns) for conns in self._idle.values()),
+        }
+
+    def close(self):
+        # Call on the client's own loop
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _reader, writer in conns:
+                writer.close()
+
+    async def _checkout(self, key: Tuple[str, str, int]):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                self.reused += 1
+                return reader, writer, True
+            self.discarded += 1
+            writer.close()
+        scheme, host, port = key
+        self.opened += 1
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                host, port, ssl=ssl.create_default_context() if scheme == "https" else None
+            ),
+            self.connect_timeout,
         )
-        conn.commit()
-    finally:
-        conn.close()
+        return reader, writer, False
 
+    def _checkin(self, key: Tuple[str, str, int], reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        idle = self._idle.setdefault(key, [])
+        if len(idle) < self.pool_size:
+            idle.append((reader, writer))
+        else:
+            self.discarded += 1
+            writer.close()
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        version, status, _ = (status_line.decode("latin-1").rstrip("\r\n") + "  ").split(" ", 2)
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts: List[bytes] = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailer section ends with an empty line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(parts)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return int(status), headers, body, keep_alive
+
+    async def request(self, url: str, headers: Dict[str, str], timeout: Optional[float] = None) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "https"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        host = key[1] if parts.port is None else f"{key[1]}:{port}"
+        head = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        raw = f"GET {target} HTTP/1.1\r\nHost: {host}\r\n{head}Connection: keep-alive\r\n\r\n".encode("latin-1")
+
+        async with self._sem:
+            self.requests += 1
+            for attempt in range(2):
+                try:
+                    reader, writer, reused = await self._checkout(key)
+                except (OSError, asyncio.TimeoutError) as e:
+                    raise urllib.error.URLError(e)
+                try:
+                    writer.write(raw)
+                    await writer.drain()
+                    status, resp_headers, body, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader), timeout if timeout is not None else self.read_timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    self.discarded += 1
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise urllib.error.URLError(e)
+                except (OSError, asyncio.TimeoutError, ValueError) as e:
+                    self.discarded += 1
+                    writer.close()
+                    raise urllib.error.URLError(e)
+                if keep_alive:
+                    self._checkin(key, reader, writer)
+                else:
+                    self.discarded += 1
+                    writer.close()
+                return status, resp_headers, body
+        raise urllib.error.URLError("connection pool exhausted retries")
+
+
+_ASYNC_CLIENTS: Dict[asyncio.AbstractEventLoop, AsyncHTTPClient] = {}
+_ASYNC_CLIENTS_LOCK = threading.Lock()
+
+# Sync callers (Flask views, SWR refreshes, the warm CLI) all run the async
+# code on this one long-lived loop, so they share its client and keep-alive
+# connections instead of each thread getting a loop of its own.
+_ASYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_ASYNC_LOOP_LOCK = threading.Lock()
+
+
+def _async_client() -> AsyncHTTPClient:
+    loop = asyncio.get_running_loop()
+    with _ASYNC_CLIENTS_LOCK:
+        client = _ASYNC_CLIENTS.get(loop)
+        if client is None:
+            # Forget clients of loops that have since closed (asyncio.run);
+            # their sockets close with the transports.
+            for old in [old for old in _ASYNC_CLIENTS if old.is_closed()]:
+                del _ASYNC_CLIENTS[old]
+            client = _ASYNC_CLIENTS[loop] = AsyncHTTPClient(
+                concurrency=_BGG_ASYNC_CONCURRENCY,
+                pool_size=_BGG_HTTP_POOL_SIZE,
+                connect_timeout=_BGG_HTTP_CONNECT_TIMEOUT,
+                read_timeout=_BGG_HTTP_READ_TIMEOUT,
+            )
+    return client
+
+
+async def _close_async_client():
+    # Closes the running loop's client, e.g. on ASGI lifespan shutdown; the
+    # next request on this loop opens a fresh one.
+    with _ASYNC_CLIENTS_LOCK:
+        client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        client.close()
+
+
+def _http_client_stats() -> Dict[str, int]:
+    with _ASYNC_CLIENTS_LOCK:
+        clients = list(_ASYNC_CLIENTS.values())
+    totals = {"requests": 0, "opened": 0, "reused": 0, "discarded": 0, "idle": 0}
+    for client in clients:
+        for field, value in client.stats().items():
+            totals[field] += value
+    return totals
+
+
+def _async_loop() -> asyncio.AbstractEventLoop:
+    global _ASYNC_LOOP
+    with _ASYNC_LOOP_LOCK:
+        if _ASYNC_LOOP is None or _ASYNC_LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="bgg-async", daemon=True).start()
+            _ASYNC_LOOP = loop
+        return _ASYNC_LOOP
+
+
+def _run_async(coro: Awaitable[Any]) -> Any:
+    # Blocks the calling thread until ``coro`` finishes on the shared loop.
+    # Coroutine code must await the async variant instead: blocking a loop
+    # here would stall it (or deadlock, on the shared loop itself).
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("_run_async called from a running event loop")
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop()).result()
+
+
+async def _http_get_async(url: str, timeout: Optional[float] = None) -> bytes:
+    # Client-side rate limiting, shared across loops and threads; the wait
+    # is awaited rather than slept
+    waited = _BGG_RATE_LIMITER.reserve()
+    if waited > 0:
+        _METRICS.inc("bgg_ratelimit_sleep_seconds_total", waited)
+        _METRICS.inc("bgg_ratelimit_waits_total")
+        await asyncio.sleep(waited)
+    endpoint = _bgg_endpoint(url)
+    client = _async_client()
+    for _ in range(_BGG_HTTP_MAX_REDIRECTS + 1):
+        started = time.perf_counter()
+        try:
+            status, headers, body = await client.request(url, _BGG_HEADERS, timeout=timeout)
+        finally:
+            _METRICS.observe("bgg_upstream_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+        _METRICS.inc("bgg_upstream_requests_total", endpoint=endpoint, status=str(status))
+        if status in (301, 302, 303, 307, 308) and headers.get("location"):
+            url = urllib.parse.urljoin(url, headers["location"])
+            continue
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, f"BGG responded {status}", headers, None)
+        return body
+    raise urllib.error.URLError(f"too many redirects for {url}")
 
-def _http_get(url: str, timeout: int = 20) -> bytes:
-    # Simple client-side rate limiting
-    global _LAST_HTTP_TS
-    delta = time.time() - _LAST_HTTP_TS
-    if delta < _MIN_HTTP_INTERVAL_SEC:
-        time.sleep(_MIN_HTTP_INTERVAL_SEC - delta)
-    headers = {
-        # Use a browser-like UA to avoid any overly strict filters/CDN heuristics
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/124.0 Safari/537.36 BoardGameLibrary/1.0"
-        ),
-        "Accept": "application/xml, text/xml;q=0.9, */*;q=0.8",
-        "Connection": "keep-alive",
-    }
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        data = resp.read()
-        _LAST_HTTP_TS = time.time()
-        return data
+
+def _http_get(url: str, timeout: Optional[float] = None) -> bytes:
+    return _run_async(_http_get_async(url, timeout))
 
 
 def _maybe_decompress(data: bytes) -> bytes:
@@ -302,35 +1839,111 @@ def _maybe_decompress(data: bytes) -> bytes:
         # Not compressed (or not a supported format) — use as-is
         return data
 
-def _get_xml(url: str, tries: int = 5, backoff: float = 1.2) -> Optional[ET.Element]:
-    last_err: Optional[Exception] = None
-    for attempt in range(tries):
-        try:
-            data = _http_get(url)
+def _open_xml_stream(data: bytes) -> IO[bytes]:
+    # Decompress lazily so the parser never sees a full decompressed copy.
+    if data.startswith(b"\x1f\x8b"):
+        return gzip.GzipFile(fileobj=io.BytesIO(data))
+    if data[:1] == b"\x78":
+        # zlib is rare from BGG; inflate up front rather than stream it
+        return io.BytesIO(_maybe_decompress(data))
+    return io.BytesIO(data)
+
 
-            data = _maybe_decompress(data)
+def _parse_xml_root(data: bytes) -> ET.Element:
+    data = _maybe_decompress(data)
 
-            # Quick detection for queue/processing messages (on decompressed data)
-            if b"<message" in data and (b"queue" in data.lower() or b"process" in data.lower()):
-                print("BGG indicates queued response, retrying...")
-                raise RuntimeError("BGG queued response")
+    # Quick detection for queue/processing messages (on decompressed data)
+    if b"<message" in data and (b"queue" in data.lower() or b"process" in data.lower()):
+        print("BGG indicates queued response, retrying...")
+        raise BGGQueuedError("BGG queued response")
 
-            root = ET.fromstring(data)
+    root = ET.fromstring(data)
 
-            # Some queued responses parse as <message>...
-            if root.tag.lower() == "message":
-                raise RuntimeError("BGG queued response")
+    # Some queued responses parse as <message>...
+    if root.tag.lower() == "message":
+        raise BGGQueuedError("BGG queued response")
 
-            return root
+    return root
 
-        except (urllib.error.URLError, urllib.error.HTTPError, ET.ParseError, RuntimeError) as e:
-            last_err = e
+
+def _stream_xml_items(data: bytes) -> Iterator[ET.Element]:
+    # Reads up to the root element eagerly so queued <message> replies and
+    # empty bodies are raised here (and retried); the items themselves are
+    # parsed lazily by the returned generator.
+    events = ET.iterparse(_open_xml_stream(data), events=("start", "end"))
+    _, root = next(events)
+    if root.tag.lower() == "message":
+        print("BGG indicates queued response, retrying...")
+        raise BGGQueuedError("BGG queued response")
+    return _walk_xml_items(events, root)
+
+
+def _walk_xml_items(events: Iterator[Tuple[str, ET.Element]], root: ET.Element) -> Iterator[ET.Element]:
+    depth = 0
+    for event, el in events:
+        if event == "start":
+            depth += 1
+            continue
+        if depth == 1 and el.tag == "item":
+            yield el
+            # Drop the finished item (and anything before it) from the tree
+            root.clear()
+        depth -= 1
+
+
+def _bgg_error_kind(err: Exception) -> str:
+    if isinstance(err, BGGQueuedError):
+        return "queued"
+    if isinstance(err, urllib.error.HTTPError):
+        return "http"
+    if isinstance(err, (ET.ParseError, StopIteration, EOFError)):
+        return "parse"
+    if isinstance(err, OSError):
+        return "network"
+    return "other"
+
+
+async def _bgg_request_async(url: str, parse: Callable[[bytes], Any], tries: int, backoff: float) -> Any:
+    # GET ``url`` and ``parse`` the body, retrying failures of either with a
+    # linear backoff; None once ``tries`` run out.
+    endpoint = _bgg_endpoint(url)
+    for attempt in range(tries):
+        try:
+            data = await _http_get_async(url)
+            started = time.perf_counter()
+            try:
+                return parse(data)
+            finally:
+                _METRICS.observe("bgg_xml_parse_seconds", time.perf_counter() - started, endpoint=endpoint)
+        except (urllib.error.URLError, urllib.error.HTTPError, ET.ParseError, StopIteration, EOFError, OSError, RuntimeError) as e:
+            _METRICS.inc("bgg_upstream_errors_total", endpoint=endpoint, kind=_bgg_error_kind(e))
             if attempt < tries - 1:
-                time.sleep(backoff * (attempt + 1))
+                _METRICS.inc("bgg_upstream_retries_total", endpoint=endpoint)
+                await asyncio.sleep(backoff * (attempt + 1))
                 continue
     return None
 
 
+def _items_parser(consume: Callable[[Iterator[ET.Element]], T]) -> Callable[[bytes], T]:
+    # Top-level <item> elements of a /thing or /search response, streamed
+    # with iterparse unless BGG_STREAMING_XML=0. ``consume`` runs inside the
+    # retry loop, so a body truncated mid-stream is refetched rather than
+    # returning (and caching) the items before the cut.
+    if not _BGG_STREAMING_XML:
+        return lambda data: consume(iter(_parse_xml_root(data).findall("item")))
+    return lambda data: consume(_stream_xml_items(data))
+
+
+async def _get_xml_async(url: str, tries: int = 5, backoff: float = 1.2) -> Optional[ET.Element]:
+    return await _bgg_request_async(url, _parse_xml_root, tries, backoff)
+
+
+async def _get_xml_items_async(
+    url: str, consume: Callable[[Iterator[ET.Element]], T], tries: int = 5, backoff: float = 1.2
+) -> Optional[T]:
+    return await _bgg_request_async(url, _items_parser(consume), tries, backoff)
+
+
 def _slugify(s: str) -> str:
     out = []
     last_dash = False
@@ -552,6 +2165,11 @@ def _normalize_game_payload(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return _sanitize_game_obj(normalized)
 
 
+def _parse_alternate_names(item: ET.Element) -> List[str]:
+    names = [el.get("value") or "" for el in item.findall("name") if el.get("type") == "alternate"]
+    return _dedupe_preserve(n.strip() for n in names if n and n.strip())
+
+
 def _parse_thing_item(item: ET.Element) -> Optional[Dict[str, Any]]:
     gid_attr = item.get("id") or item.get("objectid")
     if not gid_attr:
@@ -650,50 +2268,138 @@ def _parse_thing_item(item: ET.Element) -> Optional[Dict[str, Any]]:
     return _sanitize_game_obj(game)
 
 
-def _hydrate_games(ids: List[int]) -> List[Dict[str, Any]]:
-    if not ids:
-        return []
+def _thing_urls(ids: List[int], batch_size: int = 40) -> List[str]:
+    return [f"{BGG_BASE}/thing?id={','.join(str(x) for x in chunk)}&stats=1" for chunk in _chunked(ids, batch_size) if chunk]
+
 
+def _parse_thing_items(items: Iterator[ET.Element]) -> Tuple[List[Dict[str, Any]], Dict[int, List[str]]]:
+    fetched: List[Dict[str, Any]] = []
+    alt_names: Dict[int, List[str]] = {}
+    for item in items:
+        # Normalize once here so every tier holds the current shape
+        parsed = _normalize_game_payload(_parse_thing_item(item))
+        if not parsed:
+            continue
+        alt_names[int(parsed["id"])] = _parse_alternate_names(item)
+        fetched.append(parsed)
+    return fetched, alt_names
+
+
+def _store_thing_items(
+    parsed: Optional[Tuple[List[Dict[str, Any]], Dict[int, List[str]]]], results: Dict[int, Dict[str, Any]]
+):
+    if parsed is None:
+        return
+    fetched, alt_names = parsed
+    for game in fetched:
+        gid_int = int(game["id"])
+        _THING_CACHE.set(gid_int, game)
+        results[gid_int] = game
+    _METRICS.observe("bgg_hydrate_batch_size", len(fetched), stage="fetched")
+    # One transaction per fetched chunk
+    _pc_set_things(fetched, normalized=True, alt_names=alt_names)
+
+
+async def _fetch_things_async(ids: List[int], results: Dict[int, Dict[str, Any]], batch_size: int = 40):
+    # Chunks run concurrently on the loop, bounded by the client semaphore
+    async def one(url: str):
+        _store_thing_items(await _get_xml_items_async(url, _parse_thing_items), results)
+
+    await asyncio.gather(*(one(url) for url in _thing_urls(ids, batch_size)))
+
+
+def _fetch_things(ids: List[int], results: Dict[int, Dict[str, Any]], batch_size: int = 40):
+    _run_async(_fetch_things_async(ids, results, batch_size))
+
+
+async def _fetch_things_once_async(ids: List[int], results: Dict[int, Dict[str, Any]]) -> Dict[Any, _Flight]:
+    # Fetches the ids no other request is already fetching; returns the
+    # flights for the rest so the caller can wait on them if it wants.
+    owned, waiting = _BGG_INFLIGHT.claim(("thing", gid) for gid in ids)
+    try:
+        await _fetch_things_async([key[1] for key in owned], results)
+    except BaseException as e:
+        _BGG_INFLIGHT.fail(owned, e)
+        raise
+    for key in owned:
+        _BGG_INFLIGHT.resolve(key, results.get(key[1]))
+    return waiting
+
+
+def _fetch_things_once(ids: List[int], results: Dict[int, Dict[str, Any]]) -> Dict[Any, _Flight]:
+    return _run_async(_fetch_things_once_async(ids, results))
+
+
+def _hydrate_cached(ids: List[int], stale: Optional[Set[Any]] = None) -> Tuple[Dict[int, Dict[str, Any]], List[int]]:
+    # Memory and cache.db tiers for _hydrate_games(_async); returns what
+    # they had and the ids still to fetch. Entries served from past their
+    # TTL (inside the stale window) are refreshed in the background and
+    # their ids added to ``stale``.
     results: Dict[int, Dict[str, Any]] = {}
     missing: List[int] = []
 
+    cold: List[int] = []
     for gid in ids:
+        # Both tiers only ever hold normalized payloads
         cached = _THING_CACHE.get(gid)
         if cached:
-            normalized = _normalize_game_payload(cached)
-            if normalized:
-                results[gid] = normalized
-                if normalized is not cached:
-                    _THING_CACHE.set(gid, normalized)
-                continue
-        cached_db = _pc_get_thing(gid, need_stats=True)
+            results[gid] = cached
+            continue
+        cold.append(gid)
+
+    _METRICS.observe("bgg_hydrate_batch_size", len(ids), stage="requested")
+    _METRICS.inc("bgg_cache_lookups_total", len(ids) - len(cold), kind="thing", tier="memory", result="hit")
+    _METRICS.inc("bgg_cache_lookups_total", len(cold), kind="thing", tier="memory", result="miss")
+
+    # One IN (...) lookup for everything the memory tier didn't have
+    stale_ids: Set[int] = set()
+    stored = _pc_get_things(cold, need_stats=True, stale=stale_ids) if cold else {}
+    if cold:
+        _METRICS.observe("bgg_hydrate_batch_size", len(cold), stage="db")
+        _METRICS.inc("bgg_cache_lookups_total", len(stored) - len(stale_ids), kind="thing", tier="db", result="hit")
+        _METRICS.inc("bgg_cache_lookups_total", len(stale_ids), kind="thing", tier="db", result="stale")
+        _METRICS.inc("bgg_cache_lookups_total", len(cold) - len(stored), kind="thing", tier="db", result="miss")
+    for gid in cold:
+        cached_db = stored.get(gid)
         if cached_db:
-            _THING_CACHE.set(gid, cached_db)
+            _THING_CACHE.set(gid, cached_db, ttl=_SWR_MEMORY_TTL if gid in stale_ids else None)
             results[gid] = cached_db
             continue
         missing.append(gid)
 
-    for chunk in _chunked(missing, 40):
-        if not chunk:
-            continue
-        url = f"{BGG_BASE}/thing?id={','.join(str(x) for x in chunk)}&stats=1"
-        root = _get_xml(url)
-        if root is None:
+    if stale_ids:
+        _swr_schedule((("thing", gid) for gid in stale_ids), lambda keys: _fetch_things_once([k[1] for k in keys], {}))
+        if stale is not None:
+            stale.update(stale_ids)
+    return results, missing
+
+
+async def _hydrate_games_async(ids: List[int], stale: Optional[Set[Any]] = None) -> List[Dict[str, Any]]:
+    if not ids:
+        return []
+    results, missing = _hydrate_cached(ids, stale)
+
+    waiting = await _fetch_things_once_async(missing, results) if missing else {}
+    for key, flight in waiting.items():
+        try:
+            shared = await flight.wait_async()
+        except Exception:
             continue
-        for item in root.findall("item"):
-            parsed = _parse_thing_item(item)
-            if not parsed:
-                continue
-            gid_int = int(parsed["id"])
-            _pc_set_thing(gid_int, parsed)
-            _THING_CACHE.set(gid_int, parsed)
-            results[gid_int] = parsed
+        if shared:
+            results[key[1]] = shared
 
     return [results[gid] for gid in ids if gid in results]
 
 
-def _fetch_hot_ids(kind: str) -> List[int]:
-    root = _get_xml(f"{BGG_BASE}/hot?type={urllib.parse.quote(kind)}")
+def _hydrate_games(ids: List[int], stale: Optional[Set[Any]] = None) -> List[Dict[str, Any]]:
+    return _run_async(_hydrate_games_async(ids, stale)) if ids else []
+
+
+def _hot_url(kind: str) -> str:
+    return f"{BGG_BASE}/hot?type={urllib.parse.quote(kind)}"
+
+
+def _parse_hot_ids(root: Optional[ET.Element]) -> List[int]:
     if root is None:
         return []
 
@@ -710,55 +2416,160 @@ def _fetch_hot_ids(kind: str) -> List[int]:
     return _dedupe_preserve(parsed_ids)
 
 
-def _get_hot_ids(kind: str = "boardgame") -> List[int]:
+def _store_hot_ids(kind: str, fresh: List[int]) -> List[int]:
+    if fresh:
+        cache_key = f"hot:{kind}"
+        _HOT_IDS_CACHE.set(cache_key, fresh)
+        _pc_set_hot(cache_key, fresh)
+    return fresh
+
+
+async def _refresh_hot_ids_async(kind: str) -> List[int]:
+    return _store_hot_ids(kind, _parse_hot_ids(await _get_xml_async(_hot_url(kind))))
+
+
+def _refresh_hot_ids(kind: str) -> List[int]:
+    return _run_async(_refresh_hot_ids_async(kind))
+
+
+def _lookup_hot_ids(kind: str, stale: Optional[Set[Any]] = None) -> Tuple[Optional[List[int]], List[int]]:
+    # Cache tiers for _get_hot_ids(_async): (ids to serve, or None to fetch;
+    # a short cached list to fall back on if the fetch comes back empty).
     cache_key = f"hot:{kind}"
     ids = _HOT_IDS_CACHE.get(cache_key)
     if ids and len(ids) >= _HOT_MIN_EXPECTED:
-        return ids
+        _METRICS.inc("bgg_cache_lookups_total", kind="hot", tier="memory", result="hit")
+        return ids, ids
+    _METRICS.inc("bgg_cache_lookups_total", kind="hot", tier="memory", result="miss")
 
-    stored = _pc_get_hot(cache_key)
+    stored, stored_stale = _pc_get_hot_entry(cache_key)
     if stored and len(stored) >= _HOT_MIN_EXPECTED:
+        _METRICS.inc("bgg_cache_lookups_total", kind="hot", tier="db", result="stale" if stored_stale else "hit")
+        if stored_stale:
+            _swr_schedule([("hot", kind)], lambda _keys: _BGG_INFLIGHT.do(("hot", kind), lambda: _refresh_hot_ids(kind)))
+            if stale is not None:
+                stale.add(("hot", kind))
+            return stored, stored
         _HOT_IDS_CACHE.set(cache_key, stored)
-        return stored
+        return stored, stored
+    _METRICS.inc("bgg_cache_lookups_total", kind="hot", tier="db", result="miss")
+    return None, ids or stored or []
 
-    fresh = _fetch_hot_ids(kind)
-    if fresh:
-        _HOT_IDS_CACHE.set(cache_key, fresh)
-        _pc_set_hot(cache_key, fresh)
-        return fresh
 
-    if ids:
-        return ids
-    if stored:
-        return stored
-    return fresh
+async def _get_hot_ids_async(kind: str = "boardgame", stale: Optional[Set[Any]] = None) -> List[int]:
+    found, fallback = _lookup_hot_ids(kind, stale)
+    if found is not None:
+        return found
+    fresh = await _BGG_INFLIGHT.do_async(("hot", kind), lambda: _refresh_hot_ids_async(kind))
+    return fresh or fallback
+
+
+def _get_hot_ids(kind: str = "boardgame", stale: Optional[Set[Any]] = None) -> List[int]:
+    return _run_async(_get_hot_ids_async(kind, stale))
 
 
-def _get_search_ids(query: str) -> List[int]:
-    norm = re.sub(r"\s+", " ", query.strip().lower())
+def _search_norm(query: str) -> str:
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+async def _get_search_ids_async(
+    query: str,
+    stale: Optional[Set[Any]] = None,
+    min_local: int = _LOCAL_SEARCH_MIN_RESULTS,
+    partial: Optional[Set[Any]] = None,
+) -> List[int]:
+    # ``stale`` collects keys served past their TTL, as elsewhere;
+    # ``partial`` collects searches answered from local FTS matches rather
+    # than a BGG result.
+    norm = _search_norm(query)
     if not norm:
         return []
-
+    found, local = _lookup_search_ids(query, norm, stale, min_local, partial)
+    if found is not None:
+        return found
+    ids = await _BGG_INFLIGHT.do_async(("search", norm), lambda: _fetch_search_ids_async(query, norm))
+    return ids if ids is not None else _local_fallback(norm, local, partial)
+
+
+def _get_search_ids(
+    query: str,
+    stale: Optional[Set[Any]] = None,
+    min_local: int = _LOCAL_SEARCH_MIN_RESULTS,
+    partial: Optional[Set[Any]] = None,
+) -> List[int]:
+    return _run_async(_get_search_ids_async(query, stale, min_local, partial))
+
+
+def _local_fallback(norm: str, local: List[int], partial: Optional[Set[Any]]) -> List[int]:
+    # BGG failed: fewer local matches than wanted still beat no results
+    if local and partial is not None:
+        partial.add(("search", norm))
+    return local
+
+
+def _lookup_search_ids(
+    query: str,
+    norm: str,
+    stale: Optional[Set[Any]] = None,
+    min_local: int = _LOCAL_SEARCH_MIN_RESULTS,
+    partial: Optional[Set[Any]] = None,
+) -> Tuple[Optional[List[int]], List[int]]:
+    # Memory, cache.db and local FTS tiers for _get_search_ids(_async).
+    # Returns (ids or None when BGG has to be asked, local matches to fall
+    # back on if BGG fails).
     cached = _SEARCH_CACHE.get(norm)
     if cached is not None:
-        return cached
+        _METRICS.inc("bgg_cache_lookups_total", kind="search", tier="memory", result="hit")
+        return cached, []
+    _METRICS.inc("bgg_cache_lookups_total", kind="search", tier="memory", result="miss")
 
-    stored = _pc_get_search(norm)
+    stored, stored_stale = _pc_get_search_entry(norm)
     if stored is not None:
+        _METRICS.inc("bgg_cache_lookups_total", kind="search", tier="db", result="stale" if stored_stale else "hit")
+        if stored_stale:
+            _swr_schedule([("search", norm)], lambda _keys: _BGG_INFLIGHT.do(("search", norm), lambda: _fetch_search_ids(query, norm)))
+            if stale is not None:
+                stale.add(("search", norm))
+            return stored, []
         _SEARCH_CACHE.set(norm, stored)
-        return stored
-
+        return stored, []
+    _METRICS.inc("bgg_cache_lookups_total", kind="search", tier="db", result="miss")
+
+    local: List[int] = []
+    if _LOCAL_SEARCH:
+        # Answer from games we already have when they fill the page, and
+        # top up from BGG in the background; the BGG result replaces this
+        # one once cached.
+        local = _pc_search_local(norm)
+        if local and len(local) >= max(1, min_local):
+            _METRICS.inc("bgg_cache_lookups_total", kind="search", tier="fts", result="hit")
+            _swr_schedule([("search", norm)], lambda _keys: _BGG_INFLIGHT.do(("search", norm), lambda: _fetch_search_ids(query, norm)))
+            if partial is not None:
+                partial.add(("search", norm))
+            return local, local
+        _METRICS.inc("bgg_cache_lookups_total", kind="search", tier="fts", result="miss")
+    return None, local
+
+
+def _search_url(query: str) -> str:
     params = {
         "query": query,
         "type": "boardgame,boardgameexpansion",
     }
-    url = f"{BGG_BASE}/search?{urllib.parse.urlencode(params)}"
-    root = _get_xml(url)
-    if root is None:
-        return []
+    return f"{BGG_BASE}/search?{urllib.parse.urlencode(params)}"
 
+
+async def _fetch_search_ids_async(query: str, norm: str) -> Optional[List[int]]:
+    return _store_search_ids(norm, await _get_xml_items_async(_search_url(query), _parse_search_items))
+
+
+def _fetch_search_ids(query: str, norm: str) -> Optional[List[int]]:
+    return _run_async(_fetch_search_ids_async(query, norm))
+
+
+def _parse_search_items(items: Iterator[ET.Element]) -> List[int]:
     ids: List[int] = []
-    for item in root.findall("item"):
+    for item in items:
         if (item.get("type") or "").lower() not in {"boardgame", "boardgameexpansion"}:
             continue
         gid_attr = item.get("id")
@@ -768,8 +2579,14 @@ def _get_search_ids(query: str) -> List[int]:
             ids.append(int(gid_attr))
         except (TypeError, ValueError):
             continue
+    return _dedupe_preserve(ids)
+
 
-    ids = _dedupe_preserve(ids)
+def _store_search_ids(norm: str, ids: Optional[List[int]]) -> Optional[List[int]]:
+    # Only complete responses get here: a truncated body fails the parse
+    # and is retried (or yields None) inside _bgg_request.
+    if ids is None:
+        return None
     _SEARCH_CACHE.set(norm, ids)
     _pc_set_search(norm, ids)
     return ids
@@ -782,12 +2599,13 @@ def _apply_filters(
     min_time: Optional[int],
     max_time: Optional[int],
     tag_filters: Set[str],
+    tag_mode: str = "any",
 ) -> List[Dict[str, Any]]:
     out: List[Dict[str, Any]] = []
+    tag_bits = _TAG_INDEX.query(tag_filters, tag_mode) if tag_filters else 0
     for game in games:
         g_players = game.get("players") or {}
         g_time = game.get("time") or {}
-        g_tags = set(game.get("tags") or [])
 
         if players is not None:
             g_min = int(g_players.get("min") or 0)
@@ -806,8 +2624,13 @@ def _apply_filters(
             if max_time is not None and g_min_t > max_time:
                 continue
 
-        if tag_filters and not g_tags.intersection(tag_filters):
-            continue
+        if tag_filters:
+            hit = _TAG_INDEX.test(game.get("id"), tag_bits)
+            if hit is None:
+                g_tags = set(game.get("tags") or [])
+                hit = g_tags.issuperset(tag_filters) if tag_mode == "all" else bool(g_tags.intersection(tag_filters))
+            if not hit:
+                continue
 
         out.append(game)
 
@@ -825,6 +2648,7 @@ def _extract_request_filters(args) -> Dict[str, Any]:
 
     tags_param = args.get("tags") or ""
     tag_filters = {t.strip().lower() for t in tags_param.split(",") if t.strip()}
+    tag_mode = "all" if (args.get("tag_mode") or "").strip().lower() == "all" else "any"
 
     return {
         "players": players,
@@ -832,9 +2656,39 @@ def _extract_request_filters(args) -> Dict[str, Any]:
         "min_time": min_time,
         "max_time": max_time,
         "tags": tag_filters,
+        "tag_mode": tag_mode,
     }
 
 
+def _filters_active(filters: Dict[str, Any]) -> bool:
+    return any(
+        filters.get(key) not in (None, "", set())
+        for key in ("players", "weight", "min_time", "max_time", "tags")
+    )
+
+
+def _filter_outcomes(ids: List[int], filters: Dict[str, Any]) -> Dict[int, bool]:
+    # Push filters down to the cache before paginating: pass/fail for every
+    # id whose cached row already decides it. Ids the cache doesn't know yet
+    # are left out and judged after hydration.
+    outcomes: Dict[int, bool] = {}
+    if not ids or not _filters_active(filters):
+        return outcomes
+    parts: List[Tuple[Set[int], Set[int]]] = []
+    if filters["tags"]:
+        parts.append(_TAG_INDEX.select(ids, filters["tags"], filters["tag_mode"]))
+    rest = {**filters, "tags": set()}
+    if _filters_active(rest):
+        parts.append(_pc_filter_ids(ids, rest))
+    # Failing any part is enough to fail; passing takes every part
+    for matching, known in parts:
+        for gid in known - matching:
+            outcomes[gid] = False
+    for gid in set.intersection(*(matching for matching, _ in parts)):
+        outcomes.setdefault(gid, True)
+    return outcomes
+
+
 def _paginate(games: List[Any], page: int, limit: int) -> List[Any]:
     if limit <= 0:
         return []
@@ -853,115 +2707,656 @@ def _safe_int(arg_val: Any, default: int, minimum: int, maximum: int) -> int:
     return max(minimum, min(maximum, value))
 
 
-@bp.get("/hot")
-def hot_games():
-    limit = _safe_int(request.args.get("limit", 20), 20, 1, 50)
-    page = _safe_int(request.args.get("page", 1), 1, 1, 100)
+def _cached_body(key: Tuple[Any, ...], generation: int) -> Optional[Tuple[str, bytes]]:
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is not None and entry[0] == generation:
+        return entry[1], entry[2]
+    return None
 
-    filters = _extract_request_filters(request.args)
 
-    ids = _get_hot_ids("boardgame")
-    if not ids:
-        return jsonify({"error": "Unable to load hot list from BGG"}), 502
-
-    paginated = _paginate(ids, page, 20)
-    games = _hydrate_games(paginated)
-    filtered = _apply_filters(
-        games,
-        filters["players"],
-        filters["weight"],
-        filters["min_time"],
-        filters["max_time"],
-        filters["tags"],
-    )
+def _store_body(key: Tuple[Any, ...], generation: int, body: bytes) -> str:
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    _RESPONSE_CACHE.set(key, (generation, etag, body))
+    return etag
+
+
+def _matched_etag(etag: str, if_none_match: Any) -> Optional[str]:
+    # index.py suffixes the ETag of gzipped bodies with "-gzip"
+    return next((tag for tag in (etag, f"{etag}-gzip") if if_none_match.contains(tag)), None)
+
+
+def _cache_control() -> str:
+    return f"public, max-age={_RESPONSE_MAX_AGE}, stale-while-revalidate={_RESPONSE_MAX_AGE * 5}"
+
+
+def _conditional_get(view: Callable[..., Any]) -> Callable[..., Any]:
+    """Serve a JSON view from _RESPONSE_CACHE with a strong ETag.
+
+    The ETag hashes the serialized body, so a rebuild that produces the
+    same bytes keeps it. ``If-None-Match`` is answered with 304 straight
+    from the cached entry while the cache generation is unchanged; only
+    200 responses are cached.
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        endpoint = request.path.rsplit("/", 1)[-1]
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        generation = _CACHE_GENERATION
+        cached = _cached_body(key, generation)
+        if cached is not None:
+            etag, body = cached
+            result = "hit"
+        else:
+            # Generation read before the view runs: if the view itself
+            # writes (a cold fetch), the entry is rebuilt on the next request.
+            resp = make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+            body = resp.get_data()
+            etag = _store_body(key, generation, body)
+            result = "miss"
+
+        matched = _matched_etag(etag, request.if_none_match)
+        if matched:
+            _METRICS.inc("bgg_response_cache_total", endpoint=endpoint, result="not_modified")
+            resp = Response(status=304)
+            resp.set_etag(matched)
+        else:
+            _METRICS.inc("bgg_response_cache_total", endpoint=endpoint, result=result)
+            resp = Response(body, mimetype="application/json")
+            resp.set_etag(etag)
+        resp.headers["Cache-Control"] = _cache_control()
+        return resp
+
+    return wrapper
 
-    total = len(ids)
-    pages = math.ceil(total / limit) if total and limit else 0
 
-    filters_payload = {
+def _filters_payload(filters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "players": filters["players"],
         "weight": filters["weight"],
         "min_time": filters["min_time"],
         "max_time": filters["max_time"],
         "tags": sorted(filters["tags"]),
+        "tag_mode": filters["tag_mode"],
     }
 
-    return jsonify(
-        {
-            "results": filtered,
-            "total": total,
-            "pages": pages,
-            "page": page,
-            "limit": limit,
-            "filters": filters_payload,
-            "source": "hot",
-        }
-    )
 
+def _filter_hash(scope: str, filters: Dict[str, Any]) -> str:
+    blob = json.dumps([scope, _filters_payload(filters)], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
 
-@bp.get("/search")
-def search_games():
-    query = (request.args.get("q") or "").strip()
-    if not query:
-        return jsonify({"results": [], "total": 0, "pages": 0, "page": 1, "limit": 0, "query": ""})
 
-    limit = _safe_int(request.args.get("limit", 20), 20, 1, 50)
-    page = _safe_int(request.args.get("page", 1), 1, 1, 100)
+def _ids_hash(ids: List[int]) -> str:
+    # Fingerprint of the id list a cursor position points into
+    return hashlib.blake2b(",".join(map(str, ids)).encode("ascii"), digest_size=8).hexdigest()
 
-    filters = _extract_request_filters(request.args)
 
-    ids = _get_search_ids(query)
-    if not ids:
-        filters_payload = {
-            "players": filters["players"],
-            "weight": filters["weight"],
-            "min_time": filters["min_time"],
-            "max_time": filters["max_time"],
-            "tags": sorted(filters["tags"]),
-        }
-        return jsonify(
-            {
-                "results": [],
-                "total": 0,
-                "pages": 0,
-                "page": page,
-                "limit": limit,
-                "query": query,
-                "filters": filters_payload,
-            }
-        )
+def _encode_cursor(pos: int, fhash: str, lhash: str) -> str:
+    raw = f"{pos}:{fhash}:{lhash}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-    paginated = _paginate(ids, page, 20)
-    games = _hydrate_games(paginated)
-    filtered = _apply_filters(
-        games,
-        filters["players"],
-        filters["weight"],
-        filters["min_time"],
-        filters["max_time"],
-        filters["tags"],
-    )
 
-    total = len(ids)
-    pages = math.ceil(total / limit) if total and limit else 0
+def _decode_cursor(cursor: str, fhash: str) -> Optional[Tuple[int, str]]:
+    # (position, id list fingerprint); None for anything malformed or minted
+    # for a different query/filters.
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        pos_str, cursor_hash, lhash = raw.split(":", 2)
+        pos = int(pos_str)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+    if cursor_hash != fhash or pos < 0:
+        return None
+    return pos, lhash
+
+
+class _PageTooDeep(Exception):
+    """Skipping to the requested page would hydrate more than _PAGE_MAX_SCAN unjudged ids."""
+
+
+async def _fill_page(
+    ids: List[int],
+    start: int,
+    skip: int,
+    limit: int,
+    filters: Dict[str, Any],
+    outcomes: Dict[int, bool],
+    partial_ok: bool,
+    stale: Optional[Set[Any]] = None,
+) -> Tuple[List[int], Optional[int]]:
+    """Walk ``ids`` from ``start`` until ``limit`` of them pass the filters.
+
+    ``outcomes`` holds pass/fail for the ids the cache could already judge
+    (see _filter_outcomes); those are decided for free. The rest are
+    hydrated in chunks, filtered, and their outcomes added to ``outcomes``.
+    ``skip`` matches are dropped first (page-number requests). Keeps going
+    for one extra match so the caller knows whether more exist; returns the
+    page's ids and the position to resume from (None when exhausted).
+
+    At most _PAGE_MAX_SCAN unjudged ids are hydrated while skipping
+    (_PageTooDeep past that) or looking ahead. With ``partial_ok`` (cursor
+    requests) the same budget cuts the page short, since the cursor resumes
+    exactly; a page-number request always fills its page, or the next page
+    number would skip matches.
+    """
+    selected: List[int] = []
+    scanned = 0
+    pos = start
+    while pos < len(ids):
+        gid = ids[pos]
+        if gid not in outcomes:
+            budget = _PAGE_MAX_SCAN - scanned
+            if budget <= 0 and (skip or partial_ok or len(selected) == limit):
+                if skip:
+                    raise _PageTooDeep()
+                return selected, pos
+            want = max(skip + limit + 1 - len(selected), _PAGE_HYDRATE_CHUNK)
+            if budget > 0:
+                want = min(want, budget)
+            # The next ``want`` ids not judged yet
+            chunk: List[int] = []
+            end = pos
+            while end < len(ids) and len(chunk) < want:
+                if ids[end] not in outcomes:
+                    chunk.append(ids[end])
+                end += 1
+            scanned += len(chunk)
+            games = await _hydrate_games_async(chunk, stale=stale)
+            passed = {
+                str(game.get("id"))
+                for game in _apply_filters(
+                    games,
+                    filters["players"],
+                    filters["weight"],
+                    filters["min_time"],
+                    filters["max_time"],
+                    filters["tags"],
+                    filters["tag_mode"],
+                )
+            }
+            # Ids BGG didn't return count as failing
+            for x in chunk:
+                outcomes[x] = str(x) in passed
+        if outcomes[gid]:
+            if skip:
+                skip -= 1
+            elif len(selected) == limit:
+                return selected, pos
+            else:
+                selected.append(gid)
+        pos += 1
+    return selected, None
+
+
+async def _page_response(
+    ids: List[int],
+    scope: str,
+    filters: Dict[str, Any],
+    page: int,
+    limit: int,
+    stale: Set[Any],
+    args,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    # Shared pagination for /hot and /search. A cursor resumes at an exact
+    # position in the unfiltered id list it was minted on; without one,
+    # ``page`` skips the matches of earlier pages. ``total`` and ``pages``
+    # are null until every id has been judged. Returns (payload, error).
+    fhash = _filter_hash(scope, filters)
+    lhash = _ids_hash(ids)
+    cursor = args.get("cursor")
+    active = _filters_active(filters)
+    if cursor:
+        decoded = _decode_cursor(cursor, fhash)
+        if decoded is None:
+            return None, "Invalid cursor"
+        start, cursor_lhash = decoded
+        if cursor_lhash != lhash:
+            return None, "Cursor expired: the result list has changed; start again from page 1"
+        skip = 0
+    elif active:
+        start, skip = 0, (page - 1) * limit
+    else:
+        # Every id is a match, so earlier pages are skipped by position
+        # without hydrating them.
+        start, skip = (page - 1) * limit, 0
 
-    filters_payload = {
-        "players": filters["players"],
-        "weight": filters["weight"],
-        "min_time": filters["min_time"],
-        "max_time": filters["max_time"],
-        "tags": sorted(filters["tags"]),
+    outcomes: Dict[int, bool] = {}
+    if active:
+        outcomes = _filter_outcomes(ids, filters)
+        try:
+            selected, next_pos = await _fill_page(
+                ids, start, skip, limit, filters, outcomes, partial_ok=bool(cursor), stale=stale
+            )
+        except _PageTooDeep:
+            return None, "Page too deep for these filters; follow next_cursor instead"
+        total = sum(outcomes.values()) if len(outcomes) == len(ids) else None
+    else:
+        selected = ids[start:start + limit]
+        next_pos = start + limit if start + limit < len(ids) else None
+        total = len(ids)
+    games = await _hydrate_games_async(selected, stale=stale)
+
+    has_more = next_pos is not None
+    payload = {
+        "results": games,
+        "total": total,
+        "pages": math.ceil(total / limit) if total is not None else None,
+        "page": page,
+        "limit": limit,
+        "has_more": has_more,
+        "next_cursor": _encode_cursor(next_pos, fhash, lhash) if has_more else None,
+        "filters": _filters_payload(filters),
     }
+    if args.get("facets") in ("1", "true"):
+        # Tag counts across every id not known to fail, not just this page
+        payload["facets"] = _TAG_INDEX.facets(gid for gid in ids if outcomes.get(gid, True))
+    return payload, None
+
+
+async def hot_games_async(args) -> Tuple[Dict[str, Any], int]:
+    """/hot on the event loop; ``args`` is any mapping of query parameters.
+    Returns (payload, status) for the Flask view or the ASGI app."""
+    limit = _safe_int(args.get("limit", 20), 20, 1, 50)
+    page = _safe_int(args.get("page", 1), 1, 1, 100)
+
+    filters = _extract_request_filters(args)
+
+    stale: Set[Any] = set()
+    ids = await _get_hot_ids_async("boardgame", stale=stale)
+    if not ids:
+        return {"error": "Unable to load hot list from BGG"}, 502
+
+    payload, error = await _page_response(ids, "hot", filters, page, limit, stale, args)
+    if error:
+        return {"error": error}, 400
+    payload["source"] = "hot"
+    payload["stale"] = bool(stale)
+    return payload, 200
+
 
-    return jsonify(
-        {
-            "results": filtered,
-            "total": total,
-            "pages": pages,
+async def search_games_async(args) -> Tuple[Dict[str, Any], int]:
+    """/search on the event loop; see hot_games_async."""
+    query = (args.get("q") or "").strip()
+    if not query:
+        return {"results": [], "total": 0, "pages": 0, "page": 1, "limit": 0, "query": ""}, 200
+
+    limit = _safe_int(args.get("limit", 20), 20, 1, 50)
+    page = _safe_int(args.get("page", 1), 1, 1, 100)
+
+    filters = _extract_request_filters(args)
+
+    stale: Set[Any] = set()
+    partial: Set[Any] = set()
+    # Local matches must cover every page up to this one
+    ids = await _get_search_ids_async(query, stale=stale, min_local=page * limit, partial=partial)
+    if not ids:
+        return {
+            "results": [],
+            "total": 0,
+            "pages": 0,
             "page": page,
             "limit": limit,
+            "has_more": False,
+            "next_cursor": None,
             "query": query,
-            "filters": filters_payload,
-            "source": "search",
-        }
+            "filters": _filters_payload(filters),
+        }, 200
+
+    payload, error = await _page_response(ids, f"search:{query.lower()}", filters, page, limit, stale, args)
+    if error:
+        return {"error": error}, 400
+    payload["query"] = query
+    # "local": matches among games already cached, while BGG is asked in the
+    # background (or is unavailable); "stale" only flags expired cache entries
+    payload["source"] = "local" if partial else "search"
+    payload["stale"] = bool(stale)
+    return payload, 200
+
+
+@bp.get("/hot")
+@_conditional_get
+def hot_games():
+    payload, status = _run_async(hot_games_async(request.args))
+    return jsonify(payload), status
+
+
+@bp.get("/search")
+@_conditional_get
+def search_games():
+    payload, status = _run_async(search_games_async(request.args))
+    return jsonify(payload), status
+
+
+_WEIGHT_ORDER = {"light": 0, "medium": 1, "heavy": 2}
+
+
+def _interval_overlap_ratio(a_min: float, a_max: float, b_min: float, b_max: float) -> float:
+    overlap = max(0.0, min(a_max, b_max) - max(a_min, b_min))
+    union = max(a_max, b_max) - min(a_min, b_min)
+    return 0.0 if union == 0 else overlap / union
+
+
+def _similarity(base: Dict[str, Any], other: Dict[str, Any]) -> Tuple[float, List[str], List[str]]:
+    # Same weighting as the client-side Similar page: tags 0.5, players
+    # 0.2, time 0.15, weight 0.1, rating 0.05.
+    base_tags = base.get("tags") or []
+    other_tags = set(other.get("tags") or [])
+    common = [tag for tag in base_tags if tag in other_tags]
+    union = len(set(base_tags)) + len(other_tags) - len(common)
+    tag_score = len(common) / union if union else 0.0
+
+    b_players, o_players = base.get("players") or {}, other.get("players") or {}
+    players_score = _interval_overlap_ratio(
+        b_players.get("min") or 0,
+        (b_players.get("max") or 0) + 0.0001,
+        o_players.get("min") or 0,
+        (o_players.get("max") or 0) + 0.0001,
+    )
+    b_time, o_time = base.get("time") or {}, other.get("time") or {}
+    time_score = _interval_overlap_ratio(
+        b_time.get("min") or 0, b_time.get("max") or 0, o_time.get("min") or 0, o_time.get("max") or 0
+    )
+    bw, ow = _WEIGHT_ORDER.get(base.get("weight")), _WEIGHT_ORDER.get(other.get("weight"))
+    # Unknown weight scores neutral, like a missing rating
+    weight_score = 1 - min(1, abs(bw - ow) / 2) if bw is not None and ow is not None else 0.5
+    b_rating, o_rating = base.get("rating"), other.get("rating")
+    rating_score = 1 - min(1, abs(b_rating - o_rating) / 5) if b_rating and o_rating else 0.5
+
+    score = 0.5 * tag_score + 0.2 * players_score + 0.15 * time_score + 0.1 * weight_score + 0.05 * rating_score
+
+    reasons: List[str] = []
+    if common:
+        reasons.append(f"shares {len(common)} tag{'s' if len(common) > 1 else ''}")
+    if players_score > 0:
+        reasons.append("overlapping player counts")
+    if time_score > 0:
+        reasons.append("similar playtime")
+    if weight_score == 1 and bw is not None:
+        reasons.append("same weight")
+    elif weight_score >= 0.5 and bw is not None and ow is not None:
+        reasons.append("similar weight")
+    return score, reasons, common[:4]
+
+
+def _similar_games(game_id: int, k: int, stale: Optional[Set[Any]] = None) -> Optional[Dict[str, Any]]:
+    found = _hydrate_games([game_id], stale=stale)
+    if not found:
+        return None
+    base = found[0]
+    tags = base.get("tags") or []
+
+    if _FEATURE_MATRIX is not None:
+        # Exact: score the whole catalog at once, then hydrate only the top k
+        top = _FEATURE_MATRIX.top_k(_FEATURE_MATRIX.similarity_scores(base), k, exclude=(game_id,))
+        candidates = [gid for gid, _score in top]
+        games = _pc_get_things(candidates, stale=stale)
+        results = _score_similar(base, candidates, games, k)
+        return {"game": base, "results": results, "k": k, "candidates": _FEATURE_MATRIX.stats()["games"]}
+
+    # LSH candidates first, then games sharing any tag (via the bitmap
+    # index) up to the cap: the formula is only half tags, so a one-tag
+    # overlap with matching players/time can still make the top k.
+    candidates = [gid for gid, _est in _SIMILAR_INDEX.candidates(game_id, tags)]
+    if len(candidates) < _SIMILAR_MAX_CANDIDATES and tags:
+        seen = set(candidates)
+        seen.add(game_id)
+        extra = [gid for gid in _TAG_INDEX.ids(_TAG_INDEX.query(tags)) if gid not in seen]
+        candidates += extra[:_SIMILAR_MAX_CANDIDATES - len(candidates)]
+
+    games = _pc_get_things(candidates, stale=stale)
+    return {"game": base, "results": _score_similar(base, candidates, games, k), "k": k, "candidates": len(candidates)}
+
+
+def _score_similar(
+    base: Dict[str, Any], candidates: List[int], games: Dict[int, Dict[str, Any]], k: int
+) -> List[Dict[str, Any]]:
+    scored = []
+    for gid in candidates:
+        other = games.get(gid)
+        if other is None:
+            continue
+        score, reasons, common = _similarity(base, other)
+        scored.append({"game": other, "score": round(score, 4), "reasons": reasons, "commonTags": common})
+    return heapq.nlargest(k, scored, key=lambda r: r["score"])
+
+
+@bp.get("/similar/<int:game_id>")
+def similar_games(game_id: int):
+    k = _safe_int(request.args.get("k", 10), 10, 1, 50)
+    stale: Set[Any] = set()
+    payload = _similar_games(game_id, k, stale=stale)
+    if payload is None:
+        return jsonify({"error": "Game not found"}), 404
+    payload["stale"] = bool(stale)
+    return jsonify(payload)
+
+
+def _collect_metrics() -> Iterator[Tuple[str, str, str, Dict[str, Any], float]]:
+    caches = (("search", _SEARCH_CACHE), ("thing", _THING_CACHE), ("hot", _HOT_IDS_CACHE), ("response", _RESPONSE_CACHE))
+    cache_stats = [(name, cache.stats()) for name, cache in caches]
+    for field in ("size", "capacity"):
+        for name, stats in cache_stats:
+            yield f"bgg_memory_cache_{field}", "gauge", f"In-memory TTL cache {field}.", {"cache": name}, stats[field]
+    for field in ("hits", "misses", "evictions", "expirations"):
+        for name, stats in cache_stats:
+            yield f"bgg_memory_cache_{field}_total", "counter", f"In-memory TTL cache {field}.", {"cache": name}, stats[field]
+
+    pool_stats = _http_client_stats()
+    for field in ("requests", "opened", "reused", "discarded"):
+        yield f"bgg_http_pool_{field}_total", "counter", f"BGG connection pool {field}.", {}, pool_stats[field]
+    yield "bgg_http_pool_idle", "gauge", "Idle keep-alive connections held by the pool.", {}, pool_stats["idle"]
+
+    for field, value in _TAG_INDEX.stats().items():
+        yield f"bgg_tag_index_{field}", "gauge", f"Tag bitmap index {field}.", {}, value
+    for field, value in _SIMILAR_INDEX.stats().items():
+        yield f"bgg_similar_index_{field}", "gauge", f"MinHash LSH index {field}.", {}, value
+    if _FEATURE_MATRIX is not None:
+        for field, value in _FEATURE_MATRIX.stats().items():
+            yield f"bgg_feature_matrix_{field}", "gauge", f"NumPy feature matrix {field}.", {}, value
+
+    flights = _BGG_INFLIGHT.stats()
+    for outcome in ("issued", "coalesced"):
+        for kind, value in sorted(flights[outcome].items()):
+            yield f"bgg_singleflight_{outcome}_total", "counter", f"Upstream fetches {outcome} by the single-flight layer.", {"kind": kind}, value
+
+
+@bp.get("/metrics")
+def metrics():
+    body = _METRICS.render(_collect_metrics())
+    return Response(body, content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def _read_warm_file(path: str, as_ids: bool) -> List[str]:
+    items: List[str] = []
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if as_ids:
+                if not line.isdigit():
+                    continue
+                line = str(int(line))
+            items.append(line)
+    return _dedupe_preserve(items)
+
+
+def _warm_progress_init(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bgg_warm_progress (
+            job TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            item TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated_at INTEGER NOT NULL,
+            PRIMARY KEY (job, kind, item)
+        ) WITHOUT ROWID
+        """
     )
+    conn.commit()
+
+
+def _warm_mark(conn: sqlite3.Connection, job: str, kind: str, items: Iterable[Any], status: str):
+    now = int(time.time())
+    with conn:
+        conn.executemany(
+            "UPDATE bgg_warm_progress SET status = ?, attempts = attempts + 1, updated_at = ? "
+            "WHERE job = ? AND kind = ? AND item = ?",
+            [(status, now, job, kind, str(item)) for item in items],
+        )
+
+
+def _warm_cache(
+    ids: List[str],
+    names: List[str],
+    job: str = "default",
+    batch_size: int = 40,
+    name_ids: int = 1,
+    max_attempts: int = 3,
+    restart: bool = False,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Bulk-populate cache.db with things (and searches for ``names``).
+
+    Progress is recorded per item in bgg_warm_progress under ``job``, so an
+    interrupted run picks up where it stopped. Ids already fresh in
+    bgg_cache_thing are skipped without a request; the rest are fetched in
+    ``batch_size`` id /thing calls, a client's worth at a time.
+    """
+    batch_size = max(20, min(40, batch_size))
+    conn = _pc_conn()
+    _warm_progress_init(conn)
+    now = int(time.time())
+    with conn:
+        if restart:
+            conn.execute("DELETE FROM bgg_warm_progress WHERE job = ?", (job,))
+        conn.executemany(
+            "INSERT OR IGNORE INTO bgg_warm_progress (job, kind, item, updated_at) VALUES (?, ?, ?, ?)",
+            [(job, "id", item, now) for item in ids] + [(job, "name", item, now) for item in names],
+        )
+
+    stats = {"searched": 0, "fetched": 0, "skipped": 0, "failed": 0, "requests": 0}
+    started = time.perf_counter()
+
+    # Names resolve to ids through the BGG search (cached as usual); their
+    # top ``name_ids`` hits join the id queue for this job.
+    pending_names = [
+        row["item"]
+        for row in conn.execute(
+            "SELECT item FROM bgg_warm_progress WHERE job = ? AND kind = 'name' AND status = 'pending' AND attempts < ?",
+            (job, max_attempts),
+        )
+    ]
+    for name in pending_names:
+        norm = re.sub(r"\s+", " ", name.strip().lower())
+        found = _pc_get_search(norm)
+        if found is None:
+            stats["requests"] += 1
+            found = _fetch_search_ids(name, norm)
+        if found is None:
+            _warm_mark(conn, job, "name", [name], "pending")
+            stats["failed"] += 1
+            continue
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO bgg_warm_progress (job, kind, item, updated_at) VALUES (?, 'id', ?, ?)",
+                [(job, str(gid), now) for gid in found[:name_ids]],
+            )
+        _warm_mark(conn, job, "name", [name], "done")
+        stats["searched"] += 1
+
+    pending = [
+        int(row["item"])
+        for row in conn.execute(
+            "SELECT item FROM bgg_warm_progress WHERE job = ? AND kind = 'id' AND status = 'pending' AND attempts < ?",
+            (job, max_attempts),
+        )
+    ]
+    total = len(pending)
+    done = 0
+    group_size = batch_size * _BGG_ASYNC_CONCURRENCY
+    for group in _chunked(pending, group_size):
+        fresh = set(_pc_get_things(group, need_stats=True))
+        if fresh:
+            _warm_mark(conn, job, "id", fresh, "done")
+            stats["skipped"] += len(fresh)
+        todo = [gid for gid in group if gid not in fresh]
+        if todo:
+            results: Dict[int, Dict[str, Any]] = {}
+            _fetch_things(todo, results, batch_size=batch_size)
+            stats["requests"] += math.ceil(len(todo) / batch_size)
+            got = [gid for gid in todo if gid in results]
+            missed = [gid for gid in todo if gid not in results]
+            _warm_mark(conn, job, "id", got, "done")
+            # Left pending for the next run until max_attempts is reached
+            _warm_mark(conn, job, "id", missed, "pending")
+            stats["fetched"] += len(got)
+            stats["failed"] += len(missed)
+        done += len(group)
+        elapsed = time.perf_counter() - started
+        rate = stats["fetched"] / elapsed if elapsed else 0.0
+        eta = (total - done) / (done / elapsed) if done and elapsed else 0.0
+        log(
+            f"[warm] {done}/{total} ids  fetched={stats['fetched']} skipped={stats['skipped']} "
+            f"failed={stats['failed']}  {rate:.1f} ids/s  eta {eta:.0f}s"
+        )
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["ids_per_sec"] = round(stats["fetched"] / stats["seconds"], 2) if stats["seconds"] else 0.0
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m backend.src.bgg", description="BGG cache maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="rewrite cache rows stored by an older schema version")
+    migrate.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to reclaim space")
+    warm = sub.add_parser("warm", help="bulk-populate the cache from id and/or name lists (resumable)")
+    warm.add_argument("--ids", action="append", default=[], help="file with one BGG id per line")
+    warm.add_argument("--names", action="append", default=[], help="file with one game name per line")
+    warm.add_argument("--job", default="default", help="progress key; rerun with the same job to resume")
+    warm.add_argument("--batch", type=int, default=40, help="ids per /thing request (20-40)")
+    warm.add_argument("--name-ids", type=int, default=1, help="search hits to warm per name")
+    warm.add_argument("--max-attempts", type=int, default=3, help="give up on an item after this many tries")
+    warm.add_argument("--restart", action="store_true", help="discard saved progress for this job first")
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        _pc_init()
+        count = _pc_migrate_things()
+        print(f"Migrated {count} bgg_cache_thing rows to schema version {_THING_SCHEMA_VERSION}")
+        if args.vacuum:
+            conn = _pc_open(CACHE_DB_PATH)
+            try:
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+    elif args.command == "warm":
+        ids = [item for path in args.ids for item in _read_warm_file(path, as_ids=True)]
+        names = [item for path in args.names for item in _read_warm_file(path, as_ids=False)]
+        if not ids and not names:
+            parser.error("warm needs --ids and/or --names")
+        stats = _warm_cache(
+            ids,
+            names,
+            job=args.job,
+            batch_size=args.batch,
+            name_ids=args.name_ids,
+            max_attempts=args.max_attempts,
+            restart=args.restart,
+        )
+        print(
+            f"Warmed {stats['fetched']} things ({stats['skipped']} already fresh, {stats['failed']} failed), "
+            f"{stats['searched']} searches, {stats['requests']} BGG requests in {stats['seconds']}s "
+            f"({stats['ids_per_sec']} ids/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,60 @@
 import os
 import sys
+import gzip
 import importlib.util
 
 from flask import Flask, request, make_response
+from flask.json.provider import DefaultJSONProvider
 
 from . import auth
 from . import bgg
+from .ttlcache import TTLCache
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib provider is used instead
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, output-compatible with the default one
+    (sorted keys, compact separators); anything orjson can't encode goes
+    through DefaultJSONProvider.default."""
+
+    _options = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get("indent"):
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# JSON_PROVIDER: "auto" (orjson when installed), "orjson" or "stdlib"
+JSON_PROVIDER = (os.environ.get("JSON_PROVIDER") or "auto").lower()
+
+# Responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = int(os.environ.get("GZIP_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+_COMPRESSIBLE_TYPES = {"application/json", "text/plain", "text/html"}
+# Compressed bodies of ETagged responses, so a body rebuilt with the same
+# bytes (or served from bgg's response cache) isn't gzipped again
+_GZIP_CACHE = TTLCache(capacity=256, default_ttl=10 * 60)
 
 app = Flask(__name__)
+if orjson is not None and JSON_PROVIDER != "stdlib":
+    app.json = ORJSONProvider(app)
+elif JSON_PROVIDER == "orjson":
+    raise RuntimeError("JSON_PROVIDER=orjson but orjson is not installed")
 
 # Basic secret for sessions/cookies if used
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY") or os.environ.get("JWT_SECRET") or "dev-secret-change-me"
@@ -29,10 +76,8 @@ def handle_preflight():
         return make_response("", 204)
 
 
-@app.after_request
-def add_cors_headers(resp):
+def cors_headers(origin):
     # CORS for local dev with credentialed requests
-    origin = request.headers.get("Origin")
     allow_env = os.environ.get("CORS_ALLOW_ORIGIN")  # e.g., http://localhost:3000
 
     if allow_env:
@@ -46,12 +91,56 @@ def add_cors_headers(resp):
     if allow_origin == "*" and origin:
         allow_origin = origin
 
+    return {
+        "Access-Control-Allow-Origin": allow_origin,
+        "Access-Control-Allow-Credentials": "true",
+        "Access-Control-Allow-Headers": "Content-Type, Authorization",
+        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+        "Access-Control-Expose-Headers": "Content-Type, ETag",
+    }
+
+
+@app.after_request
+def add_cors_headers(resp):
     # Set headers explicitly
-    resp.headers["Access-Control-Allow-Origin"] = allow_origin
-    resp.headers["Vary"] = "Origin"
-    resp.headers["Access-Control-Allow-Credentials"] = "true"
-    resp.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
-    resp.headers["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
-    resp.headers["Access-Control-Expose-Headers"] = "Content-Type"
+    for name, value in cors_headers(request.headers.get("Origin")).items():
+        resp.headers[name] = value
+    resp.vary.add("Origin")
 
     return resp
+
+
+def gzip_body(body, etag=None):
+    # Compressed bodies are reused per strong ETag
+    compressed = _GZIP_CACHE.get(etag) if etag else None
+    if compressed is None:
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        if etag:
+            _GZIP_CACHE.set(etag, compressed)
+    return compressed
+
+
+@app.after_request
+def compress_response(resp):
+    # Registered after add_cors_headers, so Flask runs it first
+    resp.vary.add("Accept-Encoding")
+    if (
+        resp.status_code != 200
+        or resp.direct_passthrough
+        or resp.is_streamed
+        or "Content-Encoding" in resp.headers
+        or resp.mimetype not in _COMPRESSIBLE_TYPES
+        or not request.accept_encodings["gzip"]
+    ):
+        return resp
+    body = resp.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return resp
+    etag, weak = resp.get_etag()
+    resp.set_data(gzip_body(body, etag if not weak else None))
+    resp.headers["Content-Encoding"] = "gzip"
+    # A different representation needs a different strong ETag; bgg's
+    # conditional GET accepts the suffixed form back in If-None-Match.
+    if etag:
+        resp.set_etag(f"{etag}-gzip", weak=weak)
+    return resp
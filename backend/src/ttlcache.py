@@ -0,0 +1,89 @@
+"""In-memory LRU cache with per-entry TTLs, shared by the bgg and auth blueprints."""
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTLs.
+
+    Expiry is lazy: ``get`` drops an entry it finds expired, and a min-heap of
+    expiry times lets ``set`` reclaim expired entries from the front without
+    scanning the whole cache. The heap may hold outdated records for
+    overwritten or evicted keys; it is rebuilt once it grows past twice the
+    capacity, which keeps every operation O(log n) amortized.
+    """
+
+    def __init__(self, capacity: int, default_ttl: float):
+        self.capacity = capacity
+        self.default_ttl = default_ttl
+        self.data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._expiry: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _purge(self, now: float):
+        # Expired entries at the front of the heap
+        heap = self._expiry
+        while heap and heap[0][0] < now:
+            exp, _, key = heapq.heappop(heap)
+            item = self.data.get(key)
+            if item is not None and item[0] == exp:
+                del self.data[key]
+                self.expirations += 1
+        # Enforce capacity (LRU)
+        while len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+            self.evictions += 1
+        if len(heap) > 2 * max(self.capacity, 32):
+            self._expiry = [(exp, next(self._seq), key) for key, (exp, _) in self.data.items()]
+            heapq.heapify(self._expiry)
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            item = self.data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            exp, val = item
+            if exp < time.time():
+                del self.data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            # Mark as recently used
+            self.data.move_to_end(key, last=True)
+            self.hits += 1
+            return val
+
+    def set(self, key: Any, val: Any, ttl: Optional[float] = None):
+        now = time.time()
+        exp = now + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            self.data[key] = (exp, val)
+            self.data.move_to_end(key, last=True)
+            heapq.heappush(self._expiry, (exp, next(self._seq), key))
+            self._purge(now)
+
+    def clear(self):
+        with self._lock:
+            self.data.clear()
+            self._expiry.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self.data),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
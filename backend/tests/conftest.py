@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Let tests import the app as ``backend.src`` whichever directory pytest runs from
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,174 @@
+"""/hot pagination: page numbers, cursors, totals and the deep-page guard."""
+import os
+
+import pytest
+
+from backend.src import bench, bgg
+
+HOT_IDS = list(range(1, 601))
+
+
+def _thing_xml(ids):
+    # Every third game is two-player only, so players=3 keeps two thirds
+    items = "".join(
+        f'<item type="boardgame" id="{gid}">'
+        f'<name type="primary" sortindex="1" value="Stub Game {gid}"/>'
+        f'<minplayers value="2"/><maxplayers value="{2 if gid % 3 == 0 else 4}"/>'
+        f'<minplaytime value="30"/><maxplaytime value="60"/>'
+        f'<statistics page="1"><ratings><averageweight value="2.5"/></ratings></statistics>'
+        f"</item>"
+        for gid in ids
+    )
+    return f'<?xml version="1.0" encoding="utf-8"?><items>{items}</items>'.encode()
+
+
+class _Upstream:
+    def __init__(self):
+        self.hot = HOT_IDS
+        self.thing_ids = []
+
+    def __call__(self, path, query):
+        if path.endswith("/thing"):
+            ids = [int(x) for x in query["id"][0].split(",") if x]
+            self.thing_ids.extend(ids)
+            return _thing_xml(ids)
+        items = "".join(f'<item id="{gid}" rank="{gid}"/>' for gid in self.hot)
+        return f'<?xml version="1.0" encoding="utf-8"?><items>{items}</items>'.encode()
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    previous_limiter = bgg._BGG_RATE_LIMITER
+    bgg._BGG_RATE_LIMITER = bgg.TokenBucket(rate=1e6, capacity=1e6)
+    previous_db = bench._use_cache_db(os.path.join(tmp_path, "cache.db"))
+    for cache in (bgg._HOT_IDS_CACHE, bgg._THING_CACHE, bgg._SEARCH_CACHE):
+        cache.clear()
+    responder = _Upstream()
+    try:
+        with bench.StubBGG(responder=responder):
+            yield responder
+    finally:
+        bench._use_cache_db(previous_db)
+        bgg._BGG_RATE_LIMITER = previous_limiter
+        for cache in (bgg._HOT_IDS_CACHE, bgg._THING_CACHE, bgg._SEARCH_CACHE):
+            cache.clear()
+
+
+def _hot(**args):
+    return bgg._run_async(bgg.hot_games_async({k: str(v) for k, v in args.items()}))
+
+
+def _ids(payload):
+    return [int(game["id"]) for game in payload["results"]]
+
+
+def _three_player_ids():
+    return [gid for gid in HOT_IDS if gid % 3]
+
+
+def test_unfiltered_totals_come_from_the_id_list(upstream):
+    payload, status = _hot(limit=20, page=5)
+    assert status == 200
+    assert _ids(payload) == HOT_IDS[80:100]
+    assert (payload["total"], payload["pages"]) == (600, 30)
+
+    payload, status = _hot(limit=20, page=31)
+    assert status == 200
+    assert payload["results"] == [] and not payload["has_more"]
+    assert (payload["total"], payload["pages"]) == (600, 30)
+
+
+def test_unfiltered_page_hydrates_no_lookahead(upstream):
+    _hot(limit=40, page=1)
+    assert upstream.thing_ids == HOT_IDS[:40]
+
+
+def test_filtered_totals_stay_unknown_until_every_id_is_judged(upstream):
+    payload, _ = _hot(limit=20, page=1, players=3)
+    assert _ids(payload) == _three_player_ids()[:20]
+    assert payload["has_more"]
+    assert payload["total"] is None and payload["pages"] is None
+
+    bgg._hydrate_games(HOT_IDS)
+    payload, _ = _hot(limit=20, page=1, players=3)
+    assert (payload["total"], payload["pages"]) == (400, 20)
+
+    payload, _ = _hot(limit=20, page=21, players=3)
+    assert payload["results"] == [] and not payload["has_more"]
+
+
+def test_cursor_round_trip_matches_page_numbers(upstream):
+    by_cursor = []
+    cursor = None
+    for _ in range(50):
+        args = {"limit": 20, "players": 3}
+        if cursor:
+            args["cursor"] = cursor
+        payload, status = _hot(**args)
+        assert status == 200
+        by_cursor += _ids(payload)
+        cursor = payload["next_cursor"]
+        if not cursor:
+            break
+    assert by_cursor == _three_player_ids()
+
+    by_page = []
+    for page in range(1, payload["pages"] + 1):
+        by_page += _ids(_hot(limit=20, page=page, players=3)[0])
+    assert by_page == by_cursor
+
+
+def test_cursor_rejects_other_filters(upstream):
+    payload, _ = _hot(limit=20, players=3)
+    payload, status = _hot(limit=20, players=2, cursor=payload["next_cursor"])
+    assert status == 400
+    assert payload["error"] == "Invalid cursor"
+
+
+def test_cursor_rejects_a_changed_id_list(upstream):
+    payload, _ = _hot(limit=20, players=3)
+    cursor = payload["next_cursor"]
+
+    upstream.hot = list(reversed(HOT_IDS))
+    bgg._HOT_IDS_CACHE.clear()
+    bgg._pc_conn().execute("DELETE FROM bgg_cache_hot")
+    bgg._pc_conn().commit()
+
+    payload, status = _hot(limit=20, players=3, cursor=cursor)
+    assert status == 400
+    assert payload["error"].startswith("Cursor expired")
+
+
+def test_deep_page_needs_cached_ids(upstream):
+    # Page 20 skips 380 matches: too many unjudged ids to hydrate cold
+    payload, status = _hot(limit=20, page=20, players=3)
+    assert status == 400
+    assert "next_cursor" in payload["error"]
+    assert len(upstream.thing_ids) <= bgg._PAGE_MAX_SCAN
+
+    bgg._hydrate_games(HOT_IDS)
+    calls = len(upstream.thing_ids)
+    for page in (11, 12, 20):
+        payload, status = _hot(limit=20, page=page, players=3)
+        assert status == 200
+        assert _ids(payload) == _three_player_ids()[(page - 1) * 20:page * 20]
+        assert payload["pages"] == 20
+    assert len(upstream.thing_ids) == calls
+
+
+def test_cursor_page_is_cut_short_by_the_scan_budget(upstream, monkeypatch):
+    monkeypatch.setattr(bgg, "_PAGE_MAX_SCAN", 5)
+    monkeypatch.setattr(bgg, "_PAGE_HYDRATE_CHUNK", 5)
+    first, _ = _hot(limit=20, players=3)
+    assert _ids(first) == _three_player_ids()[:20]
+
+    # A page-number request fills its page past the budget; a cursor page
+    # stops after five unjudged ids
+    payload, status = _hot(limit=20, players=3, cursor=first["next_cursor"])
+    assert status == 200
+    got = _ids(payload)
+    assert 0 < len(got) < 20
+    assert got == _three_player_ids()[20:20 + len(got)]
+    assert payload["has_more"]
+    resumed, _ = _hot(limit=20, players=3, cursor=payload["next_cursor"])
+    assert _ids(resumed)[0] == _three_player_ids()[20 + len(got)]
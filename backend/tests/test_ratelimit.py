@@ -0,0 +1,99 @@
+"""The BGG budget (about 3 requests per second) holds across threads."""
+import threading
+import time
+import urllib.error
+
+from backend.src import bench, bgg
+
+BUDGET = 1.0 / bgg._MIN_HTTP_INTERVAL_SEC
+# Allowance for sleep/timer jitter
+SLACK = 0.02
+
+
+def _max_in_window(times, window=1.0):
+    times = sorted(times)
+    best = lo = 0
+    for hi, t in enumerate(times):
+        while t - times[lo] >= window:
+            lo += 1
+        best = max(best, hi - lo + 1)
+    return best
+
+
+def _acquire_from_threads(bucket, threads, per_thread):
+    stamps = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        for _ in range(per_thread):
+            bucket.acquire()
+            with lock:
+                stamps.append(time.monotonic())
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return sorted(stamps)
+
+
+def test_module_budget_is_at_most_three_per_second():
+    assert BUDGET <= 3.0
+    assert bgg._BGG_RATE_LIMITER.capacity == 1.0
+
+
+def test_acquire_spaces_concurrent_callers():
+    bucket = bgg.TokenBucket(rate=BUDGET, capacity=1.0)
+    stamps = _acquire_from_threads(bucket, threads=8, per_thread=1)
+
+    assert len(stamps) == 8
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert min(gaps) >= bgg._MIN_HTTP_INTERVAL_SEC - SLACK
+    assert _max_in_window(stamps) <= int(BUDGET) + 1
+    # Eight tokens from a one-token bucket take at least seven intervals
+    assert stamps[-1] - stamps[0] >= 7 * bgg._MIN_HTTP_INTERVAL_SEC - SLACK
+
+
+def test_reserve_queues_waits_without_sleeping():
+    bucket = bgg.TokenBucket(rate=BUDGET, capacity=1.0)
+    started = time.monotonic()
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert time.monotonic() - started < 0.05
+    assert waits[0] == 0.0
+    for n, wait in enumerate(waits[1:], start=1):
+        assert abs(wait - n * bgg._MIN_HTTP_INTERVAL_SEC) < SLACK
+
+
+def test_http_get_budget_holds_across_threads():
+    # Real sends to a local stub through the shared limiter and pool
+    previous = bgg._BGG_RATE_LIMITER
+    bgg._BGG_RATE_LIMITER = bgg.TokenBucket(rate=BUDGET, capacity=1.0)
+    errors = []
+    try:
+        with bench.StubBGG() as stub:
+            url = f"{stub.base}/hot?type=boardgame"
+
+            def worker():
+                try:
+                    bgg._http_get(url)
+                except urllib.error.URLError as e:
+                    errors.append(e)
+
+            workers = [threading.Thread(target=worker) for _ in range(7)]
+            for t in workers:
+                t.start()
+            for t in workers:
+                t.join()
+            arrivals = list(stub.arrivals)
+            gap = stub.min_gap()
+    finally:
+        bgg._BGG_RATE_LIMITER = previous
+
+    assert not errors
+    assert len(arrivals) == 7
+    assert _max_in_window(arrivals) <= int(BUDGET) + 1
+    assert gap >= bgg._MIN_HTTP_INTERVAL_SEC - SLACK
@@ -60,6 +60,8 @@ export function DiscoverClient({
   const [total, setTotal] = useState(initialTotal)
   const [page, setPage] = useState(1)
   const [pages, setPages] = useState(initialPages)
+  // The backend reports null pages/total until it has judged every id
+  const [hasMore, setHasMore] = useState(true)
   const [loading, setLoading] = useState(false)
 
   const LIMIT = 20
@@ -225,6 +227,7 @@ export function DiscoverClient({
 
         setTotal(Number(data?.total || 0))
         setPages(Number(data?.pages || 0))
+        setHasMore(data?.has_more !== false)
         setResults(prev => (page > 1 ? [...prev, ...newResults] : newResults))
       } catch (e: any) {
         if (e?.name === 'AbortError') return
@@ -248,7 +251,7 @@ export function DiscoverClient({
     if (!el) return
     const obs = new IntersectionObserver((entries) => {
       const entry = entries[0]
-      if (entry.isIntersecting && !loading && page < effectivePages) {
+      if (entry.isIntersecting && !loading && hasMore && page < effectivePages) {
       const nowTs = Date.now()
       if (nowTs < nextAllowedAtRef.current) return
       // Reserve a slot so we don't bump pages multiple times
@@ -258,7 +261,7 @@ export function DiscoverClient({
     }, {rootMargin: '400px'})
     obs.observe(el)
     return () => obs.disconnect()
-  }, [loading, page, effectivePages])
+  }, [loading, page, effectivePages, hasMore])
 
   return (
     <div className="flex flex-col gap-6">